@@ -3,13 +3,35 @@ import pandas as pd
 import numpy as np
 import gspread
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import Request
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
+from pandas.api.types import union_categoricals
 from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+from functools import partial
+import importlib.util
+import random
+import threading
 import warnings
+import hashlib
+import gzip
+import io
+import json
+import os
+import time
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
+# Frame data di-share antar session (lihat DatasetStore), Copy-on-Write mencegah mutasi bocor.
+# pandas >= 3 selalu Copy-on-Write.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # Page config
 st.set_page_config(
     page_title="Dashboard Analitik Mahasiswa",
@@ -56,6 +78,16 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- CONFIG ---
+def get_setting(name, default):
+    """Ambil setting dari section [dashboard] di st.secrets, fallback ke env var DASHBOARD_<NAME>"""
+    try:
+        if "dashboard" in st.secrets and name in st.secrets["dashboard"]:
+            return st.secrets["dashboard"][name]
+    except Exception:
+        # Tidak ada secrets.toml sama sekali
+        pass
+    return os.environ.get(f"DASHBOARD_{name.upper()}", default)
+
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
 
 # Multiple Sheets Configuration
@@ -69,6 +101,104 @@ SHEETS_CONFIG = {
     "Big Data Assignment 3": "https://docs.google.com/spreadsheets/d/1AlnkwRg_6WU-zr5yreWPDkAPEXU_mzrBfIUIt2DXwzM/edit?gid=0#gid=0"
 }
 
+# Format Date di sheet submission, contoh: 2024-10-15T22:28:07+00:00
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+# Kolom dengan sedikit nilai unik disimpan sebagai categorical supaya hemat memory
+CATEGORICAL_COLUMNS = ["NRP", "Status"]
+
+# Backend data: "gsheet" (Google Sheets, default) atau "local" (folder CSV/Parquet per assignment)
+DATA_SOURCE_BACKEND = str(get_setting("data_source", "gsheet")).lower()
+DATA_DIR = Path(get_setting("data_dir", "data"))
+
+# Maksimal sheet yang di-fetch bersamaan (jaga supaya tidak kena quota Sheets API)
+MAX_LOAD_WORKERS = 4
+
+# Jumlah client gspread (masing-masing dengan HTTP session keep-alive) yang di-share satu proses
+CLIENT_POOL_SIZE = int(get_setting("client_pool_size", MAX_LOAD_WORKERS))
+
+# Budget request ke Google Sheets API per menit untuk satu proses server
+# (quota default Google: 60 read request / menit / user)
+SHEETS_REQUESTS_PER_MINUTE = int(get_setting("sheets_requests_per_minute", 60))
+SHEETS_MAX_RETRIES = int(get_setting("sheets_max_retries", 5))
+
+# Error API yang layak di-retry dengan exponential backoff (detik)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 32.0
+
+# Kolom turunan yang ditambahkan enrich_frame saat snapshot dipublish (tidak ikut di-export)
+DERIVED_COLUMNS = ["Passed", "Hour", "Weekday", "Day"]
+
+# Label untuk kode Weekday (0 = Monday, sama dengan Series.dt.dayofweek)
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Umur maksimal data sheet (detik), berlaku untuk cache memory dan cache disk
+SHEET_CACHE_TTL = int(get_setting("sheet_cache_ttl", 300))
+
+# Seberapa sering thread background mengecek snapshot yang perlu di-reload (detik)
+REFRESH_POLL_INTERVAL = 15
+
+# Assignment yang tidak dibuka selama ini (detik) tidak ikut di-reload di background
+REFRESH_IDLE_TIMEOUT = int(get_setting("refresh_idle_timeout", 1800))
+
+# Jumlah hasil analitik (per versi data) yang disimpan di memory
+ANALYTICS_CACHE_SIZE = 256
+
+# Jumlah bin histogram nilai (dihitung di server dari value counts)
+SCORE_HISTOGRAM_BINS = 20
+
+# Batas titik per trace chart garis; di atas ini data di-downsample (bucket waktu / LTTB)
+MAX_POINTS_PER_TRACE = 1000
+
+# Trace dengan titik lebih dari ini dirender pakai WebGL (Scattergl)
+WEBGL_POINT_THRESHOLD = 500
+
+# Jumlah figure Plotly (JSON spec) yang disimpan di memory, di-share semua session
+FIGURE_CACHE_SIZE = 128
+
+# Jumlah kombinasi filter Custom Analytics yang hasilnya disimpan per versi data
+FILTER_CACHE_SIZE = 32
+
+# Format export Custom Analytics: label -> (ekstensi file, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+if importlib.util.find_spec("openpyxl") is None:
+    # Export Excel butuh openpyxl (lihat requirements.txt)
+    EXPORT_FORMATS.pop("Excel")
+
+# Baris per chunk saat menulis export CSV, dan batas baris satu sheet Excel
+EXPORT_CHUNK_ROWS = 50000
+EXCEL_MAX_ROWS = 1048575
+
+# Jumlah dan total ukuran file export (bytes) yang sudah dibuat dan disimpan di memory;
+# file yang lebih besar dari batas ukuran langsung dibuang setelah dikirim
+EXPORT_CACHE_SIZE = 8
+EXPORT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Snapshot yang lebih muda dari ini (detik) tidak di-fetch ulang saat tombol Refresh diklik
+REFRESH_COOLDOWN = 30
+
+# Folder cache Parquet yang tetap ada setelah restart/redeploy server
+CACHE_DIR = Path(get_setting("cache_dir", ".cache/sheets"))
+
+# Naikkan kalau schema hasil preprocessing berubah, supaya file cache lama tidak dipakai
+CACHE_SCHEMA_VERSION = 3
+
+# Sheet submission bersifat append-only: refresh cukup ambil baris baru saja
+DELTA_SYNC = str(get_setting("delta_sync", "true")).lower() in ("1", "true", "yes")
+
+# Tetap lakukan full reload berkala (detik) untuk menangkap edit di baris lama
+FULL_RELOAD_INTERVAL = int(get_setting("full_reload_interval", 3600))
+
+# Jumlah baris lama yang dicek ulang (bergiliran) di setiap delta sync; edit terdeteksi -> full reload.
+# Sengaja kecil supaya delta sync tetap murah; baris yang belum kebagian giliran tertangkap full reload berkala
+SYNC_VERIFY_ROWS = int(get_setting("sync_verify_rows", 25))
+
 def get_credentials():
     """Get Google Sheets credentials from Streamlit secrets"""
     try:
@@ -104,13 +234,515 @@ def get_credentials():
     except Exception as e:
         raise Exception(f"Error loading credentials: {str(e)}")
 
+def disk_cache_path(sheet_url):
+    """Path file Parquet untuk sheet URL tertentu"""
+    key = hashlib.sha1(f"{CACHE_SCHEMA_VERSION}:{sheet_url}".encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{key}.parquet"
+
+def disk_cache_mtime(sheet_url):
+    """Waktu terakhir cache disk ditulis, None kalau belum ada"""
+    try:
+        return disk_cache_path(sheet_url).stat().st_mtime
+    except OSError:
+        return None
+
+def read_disk_cache(sheet_url, max_age=None):
+    """Baca frame yang sudah di-preprocess dari cache disk, None kalau tidak ada / terlalu lama"""
+    path = disk_cache_path(sheet_url)
+    try:
+        if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+            return None
+        return pd.read_parquet(path)
+    except Exception:
+        # File belum ada atau rusak: anggap cache miss
+        return None
+
+def write_disk_cache(sheet_url, df):
+    """Simpan frame ke cache disk secara atomic (tulis ke file sementara lalu rename)"""
+    path = disk_cache_path(sheet_url)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Cache disk hanya optimisasi, jangan sampai bikin load gagal
+        tmp_path.unlink(missing_ok=True)
+
+def sync_state_path(sheet_url):
+    """Path file JSON berisi state delta sync untuk sheet URL tertentu"""
+    return disk_cache_path(sheet_url).with_suffix(".json")
+
+def read_sync_state(sheet_url):
+    """Baca state delta sync (jumlah baris yang sudah di-ingest, header, baris terakhir, hash per baris)"""
+    try:
+        with open(sync_state_path(sheet_url), encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def write_sync_state(sheet_url, state):
+    """Simpan state delta sync secara atomic"""
+    path = sync_state_path(sheet_url)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+
+# --- DATA SOURCES ---
+class FetchScheduler:
+    """Scheduler request ke Google Sheets API yang di-share satu proses.
+    
+    - single flight: load sheet yang sama dari banyak session digabung jadi satu fetch
+    - budget request per menit (sliding window), request berikutnya antre kalau budget habis
+    - retry dengan exponential backoff untuk error quota (429) dan error server sementara
+    """
+    
+    def __init__(self, requests_per_minute, max_retries):
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self._cond = threading.Condition()
+        self._sent = deque()
+        self._inflight = {}
+        self._stats = {"requests": 0, "retries": 0, "deduplicated": 0, "queue_depth": 0, "total_wait": 0.0, "max_wait": 0.0}
+    
+    def single_flight(self, key, fn, *args, **kwargs):
+        """Jalankan fn sekali per key; pemanggil lain yang datang bersamaan menunggu hasil yang sama"""
+        with self._cond:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._stats["deduplicated"] += 1
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._cond:
+                self._inflight.pop(key, None)
+    
+    def acquire(self):
+        """Tunggu sampai budget request per menit tersedia"""
+        start = time.time()
+        with self._cond:
+            self._stats["queue_depth"] += 1
+            try:
+                while True:
+                    now = time.time()
+                    while self._sent and now - self._sent[0] >= 60:
+                        self._sent.popleft()
+                    if len(self._sent) < self.requests_per_minute:
+                        break
+                    self._cond.wait(60 - (now - self._sent[0]))
+                self._sent.append(now)
+            finally:
+                self._stats["queue_depth"] -= 1
+            
+            waited = time.time() - start
+            self._stats["requests"] += 1
+            self._stats["total_wait"] += waited
+            self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+    
+    def call(self, fn, *args, **kwargs):
+        """Panggil satu request API dengan budget + retry/backoff"""
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                if attempt == self.max_retries or getattr(e, "code", None) not in RETRYABLE_STATUS_CODES:
+                    raise
+            
+            with self._cond:
+                self._stats["retries"] += 1
+            time.sleep(min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0))
+    
+    def stats(self):
+        with self._cond:
+            now = time.time()
+            stats = dict(self._stats)
+            stats["last_minute"] = sum(1 for sent in self._sent if now - sent < 60)
+            stats["inflight"] = len(self._inflight)
+        stats["avg_wait"] = stats["total_wait"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+def assignment_filename(assignment):
+    """Nama file (tanpa ekstensi) untuk assignment, sama dengan output generate_dummy_data.py"""
+    return assignment.replace('/', '_').replace(' ', '_')
+
+class ClientPool:
+    """Pool client gspread yang sudah authorized, di-share satu proses.
+    
+    Setiap client menyimpan HTTP session sendiri (keep-alive), jadi load berikutnya memakai koneksi
+    yang masih hangat. Semua client memakai satu objek credentials dari get_credentials(), sehingga
+    token cukup di-refresh sekali (di bawah lock) untuk seluruh pool.
+    """
+    
+    def __init__(self, size, credentials_factory):
+        self.size = size
+        self.credentials_factory = credentials_factory
+        self._lock = threading.Lock()
+        self._token_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._creds = None
+        self._created = 0
+    
+    def _credentials(self):
+        with self._token_lock:
+            if self._creds is None:
+                self._creds = self.credentials_factory()
+            if not self._creds.valid:
+                self._creds.refresh(Request())
+            return self._creds
+    
+    @contextmanager
+    def checkout(self):
+        """Pinjam satu client (blocking kalau semua sedang dipakai), otomatis dikembalikan ke pool"""
+        self._slots.acquire()
+        try:
+            creds = self._credentials()
+            with self._lock:
+                client = self._idle.pop() if self._idle else None
+            if client is None:
+                client = gspread.authorize(creds)
+                with self._lock:
+                    self._created += 1
+            
+            try:
+                yield client
+            finally:
+                with self._lock:
+                    self._idle.append(client)
+        finally:
+            self._slots.release()
+    
+    def stats(self):
+        with self._lock:
+            return {"created": self._created, "idle": len(self._idle)}
+
+class GoogleSheetsSource:
+    """Backend default: satu Google Sheet per assignment sesuai SHEETS_CONFIG"""
+    label = "Google Sheets"
+    requires_auth = True
+    
+    def __init__(self, sheets_config, scheduler, client_pool):
+        self.sheets_config = sheets_config
+        self.scheduler = scheduler
+        self.client_pool = client_pool
+    
+    def assignments(self):
+        return list(self.sheets_config.keys())
+    
+    def load(self, creds, assignment, force=False):
+        sheet_url = self.sheets_config[assignment]
+        return self.scheduler.single_flight(
+            sheet_url, load_data_from_gsheet, self.client_pool, sheet_url, self.scheduler, force=force
+        )
+    
+    def load_stale(self, assignment):
+        """Snapshot terakhir di cache disk (berapapun umurnya) beserta waktu tulisnya"""
+        sheet_url = self.sheets_config[assignment]
+        mtime = disk_cache_mtime(sheet_url)
+        df = read_disk_cache(sheet_url) if mtime is not None else None
+        return (df, mtime) if df is not None else None
+
+class LocalDirectorySource:
+    """Backend offline: satu file CSV/Parquet per assignment di sebuah folder (misal output generate_dummy_data.py)"""
+    label = "Local Files"
+    requires_auth = False
+    
+    def __init__(self, directory, assignment_names):
+        self.directory = Path(directory)
+        self.assignment_names = assignment_names
+    
+    def find_file(self, assignment):
+        # Parquet diutamakan karena jauh lebih cepat dibaca daripada CSV
+        stem = assignment_filename(assignment)
+        for suffix in (".parquet", ".csv"):
+            path = self.directory / f"{stem}{suffix}"
+            if path.exists():
+                return path
+        return None
+    
+    def assignments(self):
+        return [name for name in self.assignment_names if self.find_file(name) is not None]
+    
+    def load(self, creds, assignment, force=False):
+        path = self.find_file(assignment)
+        if path is None:
+            raise FileNotFoundError(f"File {assignment_filename(assignment)}.csv/.parquet tidak ditemukan di {self.directory}")
+        return load_data_from_file(str(path))
+    
+    def load_stale(self, assignment):
+        # File lokal cukup cepat dibaca langsung
+        return None
+
+DATA_SOURCES = {
+    "gsheet": lambda: GoogleSheetsSource(
+        SHEETS_CONFIG,
+        FetchScheduler(SHEETS_REQUESTS_PER_MINUTE, SHEETS_MAX_RETRIES),
+        ClientPool(CLIENT_POOL_SIZE, get_credentials)
+    ),
+    "local": lambda: LocalDirectorySource(DATA_DIR, list(SHEETS_CONFIG.keys()))
+}
+
+if DATA_SOURCE_BACKEND not in DATA_SOURCES:
+    st.error(f"❌ data_source `{DATA_SOURCE_BACKEND}` tidak dikenal. Pilihan: {', '.join(DATA_SOURCES)}")
+    st.stop()
+
+def frame_fingerprints(df, prefix_rows):
+    """(fingerprint prefix_rows baris pertama, fingerprint seluruh frame) dari satu digest yang sama.
+    
+    Kalau fingerprint prefix sama dengan fingerprint snapshot lama, frame baru = frame lama + baris baru.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes[:prefix_rows].tobytes())
+    prefix_fingerprint = digest.hexdigest()[:16]
+    digest.update(row_hashes[prefix_rows:].tobytes())
+    return prefix_fingerprint, digest.hexdigest()[:16]
+
+def combine_fingerprints(fingerprints):
+    """Fingerprint gabungan untuk view yang terdiri dari beberapa snapshot (urutan ikut dihitung)"""
+    return hashlib.sha1("|".join(fingerprints).encode("utf-8")).hexdigest()[:16]
+
+# Rollup per bucket waktu: semua kolom additive, jadi rollup beberapa assignment/potongan data cukup dijumlahkan
+ROLLUP_BUCKETS = {"day": ["Day"], "hour": ["Hour"], "weekday_hour": ["Weekday", "Hour"]}
+
+def build_rollups(df):
+    """Rollup submission per day, hour dan weekday x hour: count, passes, scored (Nilai tidak kosong), score_sum"""
+    if not {"Nilai", "Passed", "Day", "Hour", "Weekday"}.issubset(df.columns):
+        # Sheet kosong / tanpa kolom wajib: rollup kosong, halaman tetap menampilkan pesan data kosong
+        df = pd.DataFrame({
+            "Nilai": pd.Series(dtype="float64"),
+            "Passed": pd.Series(dtype=bool),
+            "Day": pd.Series(dtype="datetime64[ns, UTC]"),
+            "Hour": pd.Series(dtype="int8"),
+            "Weekday": pd.Series(dtype="int8")
+        })
+    
+    scores = df["Nilai"].astype("float64")
+    cells = pd.DataFrame({
+        "Day": df["Day"],
+        "Hour": df["Hour"],
+        "Weekday": df["Weekday"],
+        "count": np.ones(len(df), dtype=np.int64),
+        "passes": df["Passed"].astype(np.int64),
+        "scored": scores.notna().astype(np.int64),
+        "score_sum": scores.fillna(0.0)
+    })
+    values = ["count", "passes", "scored", "score_sum"]
+    return {name: cells.groupby(keys)[values].sum() for name, keys in ROLLUP_BUCKETS.items()}
+
+def merge_rollups(rollups):
+    """Jumlahkan beberapa rollup (per assignment, atau rollup lama + rollup baris baru)"""
+    rollups = list(rollups)
+    if len(rollups) == 1:
+        return rollups[0]
+    return {
+        name: pd.concat([rollup[name] for rollup in rollups]).groupby(level=keys).sum()
+        for name, keys in ROLLUP_BUCKETS.items()
+    }
+
+Snapshot = namedtuple("Snapshot", ["frame", "loaded_at", "fingerprint", "rollups"])
+
+class DatasetStore:
+    """Snapshot data per assignment yang di-share semua session dalam satu proses.
+    
+    Frame disimpan sekali dan dibagikan sebagai shallow copy di atas Copy-on-Write, jadi tidak ada
+    pickle/unpickle per rerun dan kolom yang ditambahkan halaman tidak bocor ke session lain.
+    Snapshot yang sudah lewat SHEET_CACHE_TTL tetap langsung dipakai (stale-while-revalidate)
+    sementara thread background me-reload dan menggantinya secara atomic.
+    """
+    
+    def __init__(self, source):
+        self.source = source
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._last_access = {}
+        self._errors = {}
+        self._inflight = {}
+        self._initial = {}
+        self._creds = None
+        self._executor = ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS, thread_name_prefix="dataset-refresh")
+        threading.Thread(target=self._refresh_loop, name="dataset-refresher", daemon=True).start()
+    
+    def _publish(self, assignment, df, loaded_at):
+        # Frame dari source bisa dipegang pemanggil lain (single flight / disk cache): kolom baru
+        # hanya ditambahkan ke shallow copy (Copy-on-Write), frame asli tidak ikut berubah
+        df = df.copy(deep=False)
+        df['Assignment'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[assignment])
+        with self._lock:
+            previous = self._snapshots.get(assignment)
+        
+        prefix_rows = len(previous.frame) if previous is not None and len(previous.frame) <= len(df) else 0
+        prefix_fingerprint, fingerprint = frame_fingerprints(df, prefix_rows)
+        df = enrich_frame(df)
+        if prefix_rows and prefix_fingerprint == previous.fingerprint:
+            # Hanya ada baris baru (delta sync): rollup lama + rollup baris baru saja
+            rollups = merge_rollups([previous.rollups, build_rollups(df.iloc[prefix_rows:])])
+        else:
+            rollups = build_rollups(df)
+        
+        snap = Snapshot(df, loaded_at, fingerprint, rollups)
+        with self._lock:
+            self._snapshots[assignment] = snap
+            self._errors.pop(assignment, None)
+        return snap
+    
+    def _load_initial(self, creds, assignment):
+        """Load pertama assignment; session lain yang datang bersamaan menunggu load yang sama"""
+        with self._lock:
+            snap = self._snapshots.get(assignment)
+            if snap is not None:
+                return snap
+            future = self._initial.get(assignment)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._initial[assignment] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            snap = self._cold_load(creds, assignment)
+            future.set_result(snap)
+            return snap
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._initial.pop(assignment, None)
+    
+    def _cold_load(self, creds, assignment):
+        # Cold start: pakai snapshot dari disk dulu supaya tidak menunggu Google
+        stale = self.source.load_stale(assignment)
+        if stale is not None:
+            df, loaded_at = stale
+            snap = self._publish(assignment, df, loaded_at)
+            if time.time() - loaded_at > SHEET_CACHE_TTL:
+                self.refresh_async(assignment)
+            return snap
+        
+        return self._publish(assignment, self.source.load(creds, assignment), time.time())
+    
+    def snapshot(self, creds, assignment):
+        if creds is not None:
+            self._creds = creds
+        
+        with self._lock:
+            snap = self._snapshots.get(assignment)
+            self._last_access[assignment] = time.time()
+        
+        if snap is None:
+            return self._load_initial(creds, assignment)
+        
+        if time.time() - snap.loaded_at > SHEET_CACHE_TTL:
+            # Langsung kembalikan snapshot lama, reload jalan di background
+            self.refresh_async(assignment)
+        return snap
+    
+    def get(self, creds, assignment):
+        """Snapshot dengan frame berupa read-only view (zero-copy, perubahan hanya berlaku di view itu sendiri)"""
+        snap = self.snapshot(creds, assignment)
+        return snap._replace(frame=snap.frame.copy(deep=False))
+    
+    def loaded_at(self, assignment):
+        with self._lock:
+            snap = self._snapshots.get(assignment)
+        return snap.loaded_at if snap is not None else None
+    
+    def last_error(self, assignment):
+        """Error refresh background terakhir (snapshot lama tetap dipakai), None kalau sukses"""
+        with self._lock:
+            return self._errors.get(assignment)
+    
+    def refresh_async(self, assignment):
+        """Mulai reload di background; kalau reload assignment ini sedang jalan, pakai future yang sama"""
+        with self._lock:
+            future = self._inflight.get(assignment)
+            if future is None:
+                future = self._executor.submit(self._refresh, assignment)
+                self._inflight[assignment] = future
+        return future
+    
+    def refresh(self, creds, assignments):
+        """Reload assignment tertentu dan tunggu selesai (tombol Refresh).
+        
+        Klik beruntun dari banyak user digabung: reload yang sedang jalan ditunggu bersama, dan
+        snapshot yang umurnya belum REFRESH_COOLDOWN tidak di-fetch ulang.
+        """
+        if creds is not None:
+            self._creds = creds
+        
+        now = time.time()
+        futures = []
+        for assignment in assignments:
+            loaded_at = self.loaded_at(assignment)
+            with self._lock:
+                inflight = assignment in self._inflight
+            if inflight or loaded_at is None or now - loaded_at >= REFRESH_COOLDOWN:
+                futures.append(self.refresh_async(assignment))
+        
+        wait(futures)
+    
+    def _refresh(self, assignment):
+        try:
+            df = self.source.load(self._creds, assignment, force=True)
+            self._publish(assignment, df, time.time())
+        except Exception as e:
+            # Snapshot terakhir yang valid tetap dipakai
+            with self._lock:
+                self._errors[assignment] = e
+        finally:
+            with self._lock:
+                self._inflight.pop(assignment, None)
+    
+    def _refresh_loop(self):
+        # Reload terjadwal untuk assignment yang masih dibuka user, sebelum ada yang menunggu data expired
+        while True:
+            time.sleep(REFRESH_POLL_INTERVAL)
+            now = time.time()
+            with self._lock:
+                due = [
+                    assignment for assignment, snap in self._snapshots.items()
+                    if now - snap.loaded_at > SHEET_CACHE_TTL
+                    and now - self._last_access.get(assignment, 0) < REFRESH_IDLE_TIMEOUT
+                ]
+            for assignment in due:
+                self.refresh_async(assignment)
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_store(backend):
+    """Satu DatasetStore per proses server untuk setiap backend"""
+    return DatasetStore(DATA_SOURCES[backend]())
+
+DATASET_STORE = get_dataset_store(DATA_SOURCE_BACKEND)
+DATA_SOURCE = DATASET_STORE.source
+
 # Initialize authentication
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
     st.session_state.creds = None
 
-# Auth section
-if not st.session_state.authenticated:
+# Auth section (backend lokal tidak butuh credentials)
+if DATA_SOURCE.requires_auth and not st.session_state.authenticated:
     st.markdown('<div class="main-header">📊 Dashboard Analitik Mahasiswa</div>', unsafe_allow_html=True)
     
     st.info("🔐 Connecting to Google Sheets...")
@@ -277,10 +909,11 @@ with st.sidebar:
     
     # Assignment selector
     st.subheader("📚 Pilih Assignment")
+    available_assignments = DATA_SOURCE.assignments()
     selected_assignments = st.multiselect(
         "Assignment:",
-        options=list(SHEETS_CONFIG.keys()),
-        default=[list(SHEETS_CONFIG.keys())[0]],
+        options=available_assignments,
+        default=available_assignments[:1],
         help="Pilih satu atau lebih assignment untuk dianalisis"
     )
     
@@ -296,91 +929,702 @@ with st.sidebar:
     
     st.divider()
     
-    # Refresh button
-    if st.button("🔄 Refresh Data", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
+    # Refresh button: hanya assignment yang dipilih (atau satu assignment tertentu)
+    refresh_target = "Semua yang dipilih"
+    if len(selected_assignments) > 1:
+        refresh_target = st.selectbox(
+            "Refresh:",
+            ["Semua yang dipilih"] + selected_assignments,
+            help="Reload data assignment dari sumber data tanpa mengganggu assignment lain"
+        )
     
-    st.divider()
+    if st.button("🔄 Refresh Data", use_container_width=True, disabled=not selected_assignments):
+        refresh_targets = selected_assignments if refresh_target == "Semua yang dipilih" else [refresh_target]
+        with st.spinner(f"Refreshing {', '.join(refresh_targets)}..."):
+            DATASET_STORE.refresh(st.session_state.creds, refresh_targets)
     
-    # Show connection status
-    st.success("✅ Connected")
+    st.divider()
     
-    # Logout button
-    if st.button("🚪 Logout", use_container_width=True):
-        st.session_state.authenticated = False
-        st.session_state.creds = None
-        st.rerun()
-
-@st.cache_data(ttl=300)
-def load_data_from_gsheet(_creds, sheet_url):
-    """Load data dari Google Sheets"""
-    try:
-        client = gspread.authorize(_creds)
-        sheet = client.open_by_url(sheet_url)
-        worksheet = sheet.get_worksheet(0)
-        data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
-        
-        # Data preprocessing
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-            df = df.dropna(subset=["Date"])
-            df = df.sort_values("Date")
+    if DATA_SOURCE.requires_auth:
+        # Show connection status
+        st.success("✅ Connected")
         
-        if "Nilai" in df.columns:
-            df["Nilai"] = pd.to_numeric(df["Nilai"], errors="coerce")
+        # Status antrean request ke Google Sheets API
+        with st.expander("📡 Sheets API"):
+            api_stats = DATA_SOURCE.scheduler.stats()
+            st.write(f"Request 1 menit terakhir: **{api_stats['last_minute']}/{DATA_SOURCE.scheduler.requests_per_minute}**")
+            st.write(f"Antrean: **{api_stats['queue_depth']}** | Fetch berjalan: **{api_stats['inflight']}**")
+            st.write(f"Rata-rata tunggu: **{api_stats['avg_wait']:.2f}s** | Maks: **{api_stats['max_wait']:.2f}s**")
+            st.write(f"Retry: **{api_stats['retries']}** | Request digabung: **{api_stats['deduplicated']}**")
+            pool_stats = DATA_SOURCE.client_pool.stats()
+            st.write(f"Client pool: **{pool_stats['idle']}** idle / **{pool_stats['created']}** dibuat (maks {DATA_SOURCE.client_pool.size})")
         
-        return df
-    except Exception as e:
-        st.error(f"Gagal load data: {e}")
+        # Logout button
+        if st.button("🚪 Logout", use_container_width=True):
+            st.session_state.authenticated = False
+            st.session_state.creds = None
+            st.rerun()
+    else:
+        st.success(f"📁 {DATA_SOURCE.label}: `{DATA_SOURCE.directory}`")
+
+def parse_dates(values):
+    """Parse kolom Date dengan format ISO yang sudah diketahui, fallback ke inferensi pandas untuk format lain"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    
+    try:
+        parsed = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+    except (ValueError, TypeError):
+        # Offset timezone campuran dalam satu kolom
+        parsed = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce", utc=True)
+    
+    unparsed = parsed.isna() & values.notna() & (values.astype(str) != "")
+    if unparsed.any():
+        return pd.to_datetime(values, errors="coerce")
+    if parsed.dt.tz is None and parsed.isna().all():
+        # Sheet tanpa submission: tetap tz-aware seperti kolom Date yang terisi
+        return parsed.dt.tz_localize("UTC")
+    return parsed
+
+def parse_scores(values):
+    """Parse kolom Nilai: int16 kalau semua nilai bulat, float64 kalau ada yang kosong/desimal"""
+    scores = pd.to_numeric(values, errors="coerce")
+    if scores.notna().all() and (scores % 1 == 0).all() and scores.between(-32768, 32767).all():
+        return scores.astype("int16")
+    return scores.astype("float64")
+
+def preprocess_frame(df):
+    """Preprocess raw DataFrame ke schema typed: Date datetime, Nilai int16, NRP/Status categorical"""
+    if "Date" in df.columns:
+        df["Date"] = parse_dates(df["Date"])
+        df = df.dropna(subset=["Date"])
+        df = df.sort_values("Date", kind="stable", ignore_index=True)
+    
+    if "Nilai" in df.columns:
+        df["Nilai"] = parse_scores(df["Nilai"])
+    
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            # Kolom kosong (object) dijadikan str dulu supaya kategori bertipe sama dengan frame yang terisi
+            values = df[col].astype("str") if len(df) == 0 else df[col]
+            df[col] = values.astype("category")
+    
+    return df
+
+def enrich_frame(df):
+    """Tambah kolom turunan typed (DERIVED_COLUMNS) sekali per snapshot, dipakai bersama semua halaman.
+    
+    Passed (bool), Hour & Weekday (int8, 0 = Monday) dan Day (tanggal kalender). Urutan attempt
+    tidak disimpan di sini karena di view gabungan dihitung lintas assignment (node attempt_sequences).
+    """
+    if "Status" in df.columns:
+        df["Passed"] = (df["Status"] == "Lulus").to_numpy(dtype=bool)
+    
+    if "Date" in df.columns:
+        df["Hour"] = df["Date"].dt.hour.astype("int8")
+        df["Weekday"] = df["Date"].dt.dayofweek.astype("int8")
+        df["Day"] = df["Date"].dt.normalize()
+    
+    return df
+
+def preprocess_rows(header, rows):
+    """Ubah raw values dari sheet (list of list) menjadi DataFrame typed, dibangun per kolom"""
+    width = len(header)
+    rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+    columns = list(zip(*rows)) if rows else [()] * width
+    df = pd.DataFrame({idx: pd.Series(col, dtype=object) for idx, col in enumerate(columns)})
+    df.columns = header
+    return preprocess_frame(df)
+
+def concat_frames(frames):
+    """pd.concat yang tetap mempertahankan kolom categorical (kategori digabung, tidak jatuh ke object)"""
+    # Frame kosong (assignment belum ada submission) tidak menambah baris, dan dtype-nya bisa beda
+    frames = [frame for frame in frames if len(frame) > 0] or list(frames)[:1]
+    if len(frames) == 1:
+        return frames[0].copy()
+    
+    aligned = [frame.copy(deep=False) for frame in frames]
+    for col in frames[0].columns:
+        parts = [frame[col] for frame in frames if col in frame.columns]
+        if len(parts) == len(frames) and all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            categories = union_categoricals(parts).categories
+            for frame in aligned:
+                frame[col] = frame[col].cat.set_categories(categories)
+    
+    return pd.concat(aligned, ignore_index=True)
+
+def normalize_row(row, width):
+    """Samakan panjang row dengan header (API Sheets memotong sel kosong di akhir baris)"""
+    row = [str(value) for value in row[:width]]
+    return row + [""] * (width - len(row))
+
+def row_digest(row):
+    """Hash pendek satu baris sheet (sudah di-normalize), disimpan di sync state"""
+    return hashlib.sha1("\x1f".join(row).encode("utf-8")).hexdigest()[:12]
+
+def fetch_delta(worksheet, state, scheduler):
+    """Ambil baris baru saja sejak sync terakhir, None kalau harus full reload.
+    
+    Di request yang sama, SYNC_VERIFY_ROWS baris lama dicek ulang terhadap row_hashes (bergiliran mulai
+    verify_cursor), jadi edit di baris lama tetap ketahuan tanpa menunggu FULL_RELOAD_INTERVAL.
+    """
+    ingested = state["rows"]
+    header = state["header"]
+    verify_start = state.get("verify_cursor", 0) % ingested
+    verify_end = min(verify_start + SYNC_VERIFY_ROWS, ingested)
+    
+    # Row 1 adalah header, jadi baris data ke-i (0-based) ada di row ke-(i + 2) dan
+    # baris terakhir yang sudah di-ingest ada di row ke-(ingested + 1)
+    header_values, tail_values, verify_values = scheduler.call(worksheet.batch_get, [
+        "1:1",
+        f"{ingested + 1}:{max(worksheet.row_count, ingested + 1)}",
+        f"{verify_start + 2}:{verify_end + 1}"
+    ])
+    
+    if not header_values or normalize_row(header_values[0], len(header)) != header:
+        return None
+    
+    # Sheet menyusut atau baris terakhir berubah: data lama sudah tidak valid
+    tail_values = [normalize_row(row, len(header)) for row in tail_values]
+    if not tail_values or tail_values[0] != state["last_row"]:
         return None
+    
+    # Baris lama yang diedit (misal nilai dikoreksi): data lama juga tidak valid
+    verify_hashes = [row_digest(normalize_row(row, len(header))) for row in verify_values]
+    if verify_hashes != state["row_hashes"][verify_start:verify_end]:
+        return None
+    
+    state["verify_cursor"] = verify_end % ingested
+    return tail_values[1:]
+
+def fetch_sheet(client, sheet_url, scheduler):
+    """Download dan preprocess data dari Google Sheets, pakai delta sync kalau memungkinkan"""
+    sheet = scheduler.call(client.open_by_url, sheet_url)
+    worksheet = scheduler.call(sheet.get_worksheet, 0)
+    
+    cached_df = read_disk_cache(sheet_url) if DELTA_SYNC else None
+    state = read_sync_state(sheet_url) if cached_df is not None else None
+    
+    if (
+        state is not None
+        and state.get("rows", 0) > 0
+        and len(state.get("row_hashes", [])) == state["rows"]
+        and state.get("frame_rows") == len(cached_df)
+        and time.time() - state.get("full_loaded_at", 0) < FULL_RELOAD_INTERVAL
+    ):
+        new_rows = fetch_delta(worksheet, state, scheduler)
+        if new_rows is not None:
+            if new_rows:
+                new_df = preprocess_rows(state["header"], new_rows)
+                df = concat_frames([cached_df, new_df])
+                # Baris baru biasanya sudah paling akhir; sort hanya kalau perlu supaya frame lama tetap jadi prefix
+                if "Date" in df.columns and not df["Date"].is_monotonic_increasing:
+                    df = df.sort_values("Date", kind="stable", ignore_index=True)
+                state["rows"] += len(new_rows)
+                state["last_row"] = new_rows[-1]
+                state["row_hashes"].extend(row_digest(row) for row in new_rows)
+            else:
+                df = cached_df
+            state["frame_rows"] = len(df)
+            return df, state
+    
+    # Full reload
+    values = scheduler.call(worksheet.get_all_values)
+    header = [str(col) for col in values[0]] if values else []
+    rows = [normalize_row(row, len(header)) for row in values[1:]]
+    df = preprocess_rows(header, rows)
+    
+    state = {
+        "rows": len(rows),
+        "header": header,
+        "last_row": rows[-1] if rows else [],
+        "row_hashes": [row_digest(row) for row in rows],
+        "verify_cursor": 0,
+        "frame_rows": len(df),
+        "full_loaded_at": time.time()
+    }
+    return df, state
+
+def load_data_from_gsheet(client_pool, sheet_url, scheduler, force=False):
+    """Load data dari cache disk atau Google Sheets (raise exception kalau gagal)"""
+    if not force:
+        # Proses server lain mungkin baru saja menulis cache disk
+        df = read_disk_cache(sheet_url, max_age=SHEET_CACHE_TTL)
+        if df is not None:
+            return df
+    
+    with client_pool.checkout() as client:
+        df, state = fetch_sheet(client, sheet_url, scheduler)
+    write_disk_cache(sheet_url, df)
+    write_sync_state(sheet_url, state)
+    return df
+
+def load_data_from_file(path):
+    """Load data dari file CSV/Parquet lokal"""
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return preprocess_frame(df)
 
 def load_multiple_sheets(creds, assignments):
-    """Load data from multiple sheets"""
+    """Load snapshot data from multiple assignments secara paralel (bounded thread pool)"""
     all_data = {}
+    failed = {}
+    
+    if not assignments:
+        return all_data
     
     progress_bar = st.progress(0)
     status_text = st.empty()
+    status_text.text(f"Loading {len(assignments)} assignment...")
     
-    for idx, assignment in enumerate(assignments):
-        status_text.text(f"Loading {assignment}...")
-        sheet_url = SHEETS_CONFIG[assignment]
-        df = load_data_from_gsheet(creds, sheet_url)
-        if df is not None:
-            df['Assignment'] = assignment
-            all_data[assignment] = df
-        progress_bar.progress((idx + 1) / len(assignments))
+    # Worker thread hanya melakukan fetch; semua update UI tetap di script thread
+    max_workers = min(MAX_LOAD_WORKERS, len(assignments))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheet-loader") as executor:
+        futures = {
+            executor.submit(DATASET_STORE.get, creds, assignment): assignment
+            for assignment in assignments
+        }
+        
+        for done, future in enumerate(as_completed(futures), start=1):
+            assignment = futures[future]
+            try:
+                all_data[assignment] = future.result()
+                status_text.text(f"✅ {assignment} loaded ({done}/{len(assignments)})")
+            except Exception as e:
+                failed[assignment] = e
+                status_text.text(f"❌ {assignment} gagal ({done}/{len(assignments)})")
+            progress_bar.progress(done / len(assignments))
     
     progress_bar.empty()
     status_text.empty()
     
-    return all_data
+    for assignment, error in failed.items():
+        st.error(f"Gagal load data {assignment}: {error}")
+    
+    # Pertahankan urutan sesuai pilihan user
+    return {assignment: all_data[assignment] for assignment in assignments if assignment in all_data}
 
 def combine_dataframes(data_dict):
     """Combine multiple dataframes into one"""
     if not data_dict:
         return None
     
-    combined = pd.concat(data_dict.values(), ignore_index=True)
+    combined = concat_frames(data_dict.values())
     return combined
 
-def calculate_metrics(df):
-    """Calculate various metrics from dataframe"""
+def format_bytes(size):
+    """Format ukuran file, contoh: '1.2 MB'"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def format_age(seconds):
+    """Format umur snapshot data, contoh: '3 menit lalu'"""
+    if seconds < 60:
+        return "baru saja"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} menit lalu"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} jam lalu"
+    return f"{int(seconds // 86400)} hari lalu"
+
+class SharedCache:
+    """LRU cache yang di-share semua session dalam satu proses, key biasanya memuat versi data.
+    
+    max_bytes (opsional) membatasi total ukuran nilai bertipe bytes, misal file export.
+    """
+    
+    def __init__(self, max_entries, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+    
+    def peek(self, key):
+        """Nilai yang sudah ada di cache (tanpa menghitung / mengubah urutan LRU), None kalau belum ada"""
+        with self._lock:
+            value = self._entries.get(key)
+        return readonly_view(value) if value is not None else None
+    
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return readonly_view(self._entries[key])
+        
+        value = fn(*args, **kwargs)
+        size = self._size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return readonly_view(value)
+        
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._size(self._entries[key])
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+        return readonly_view(value)
+    
+    @staticmethod
+    def _size(value):
+        return len(value) if isinstance(value, bytes) else 0
+
+def readonly_view(value):
+    """Shallow copy frame/series (Copy-on-Write) supaya hasil cache yang di-share tidak ikut termutasi"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return {key: readonly_view(item) for key, item in value.items()}
+    return value
+
+@st.cache_resource(show_spinner=False)
+def get_analytics_cache():
+    """Cache hasil analitik (metrics, aggregate per mahasiswa, dst) per versi data"""
+    return SharedCache(ANALYTICS_CACHE_SIZE)
+
+ANALYTICS_CACHE = get_analytics_cache()
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache():
+    """Cache file export yang sudah dibuat, supaya download ulang (atau ukurannya) tidak perlu serialize lagi"""
+    return SharedCache(EXPORT_CACHE_SIZE, max_bytes=EXPORT_CACHE_MAX_BYTES)
+
+EXPORT_CACHE = get_export_cache()
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Cache figure Plotly yang sudah dirender, disimpan sebagai JSON spec"""
+    return SharedCache(FIGURE_CACHE_SIZE)
+
+FIGURE_CACHE = get_figure_cache()
+
+def get_figure(key, build, *args, **kwargs):
+    """Figure untuk key (versi data, assignment, halaman, nama chart, parameter chart).
+    
+    build(*args, **kwargs) hanya dipanggil kalau key belum ada di FIGURE_CACHE; rerun karena widget lain
+    cukup memuat ulang spec-nya.
+    """
+    spec = FIGURE_CACHE.get_or_compute(key, lambda: build(*args, **kwargs).to_json())
+    return pio.from_json(spec)
+
+def write_export(frame, export_format):
+    """Serialize frame ke bytes sesuai format export; CSV ditulis per EXPORT_CHUNK_ROWS baris (gzip kalau dipilih)"""
+    buffer = io.BytesIO()
+    if export_format == "CSV":
+        stream = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        for start in range(0, max(len(frame), 1), EXPORT_CHUNK_ROWS):
+            frame.iloc[start:start + EXPORT_CHUNK_ROWS].to_csv(stream, index=False, header=start == 0)
+        stream.flush()
+        stream.detach()
+    elif export_format == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as compressed:
+            stream = io.TextIOWrapper(compressed, encoding="utf-8", newline="")
+            for start in range(0, max(len(frame), 1), EXPORT_CHUNK_ROWS):
+                frame.iloc[start:start + EXPORT_CHUNK_ROWS].to_csv(stream, index=False, header=start == 0)
+            stream.flush()
+            stream.detach()
+    elif export_format == "Parquet":
+        frame.to_parquet(buffer, index=False, compression="zstd")
+    elif export_format == "Excel":
+        # Excel tidak mendukung datetime dengan timezone
+        excel_frame = frame.copy(deep=False)
+        for col in excel_frame.columns:
+            if isinstance(excel_frame[col].dtype, pd.DatetimeTZDtype):
+                excel_frame[col] = excel_frame[col].dt.tz_localize(None)
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            excel_frame.to_excel(writer, index=False)
+    else:
+        raise ValueError(f"Format export tidak dikenal: {export_format}")
+    return buffer.getvalue()
+
+def get_export(key, frame, export_format):
+    """File export yang baru dibuat saat tombol download diklik (dipanggil st.download_button), lalu di-cache"""
+    return EXPORT_CACHE.get_or_compute((key, export_format), write_export, frame, export_format)
+
+def export_button(label, key, frame, export_format, file_prefix):
+    """Tombol download dengan export yang dibuat on-demand; ukuran file tampil kalau sudah pernah dibuat"""
+    extension, mime = EXPORT_FORMATS[export_format]
+    exported = EXPORT_CACHE.peek((key, export_format))
+    if exported is not None:
+        size = format_bytes(len(exported))
+    else:
+        size = f"data ~{format_bytes(frame.memory_usage(index=False).sum())}"
+    too_large = export_format == "Excel" and len(frame) > EXCEL_MAX_ROWS
+    
+    st.download_button(
+        label=f"{label} ({len(frame):,} baris, {size})",
+        data=partial(get_export, key, frame, export_format),
+        file_name=f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+        mime=mime,
+        on_click="ignore",
+        disabled=too_large,
+        help="Terlalu banyak baris untuk satu sheet Excel" if too_large else None
+    )
+
+class StudentIndex:
+    """Partisi data per mahasiswa: frame diurutkan (NRP, Date) sekali, riwayat tiap mahasiswa = slice kontigu"""
+    
+    def __init__(self, df):
+        self.frame = df.sort_values(['NRP', 'Date'], kind='stable')
+        nrps, starts, counts = np.unique(
+            self.frame['NRP'].to_numpy(dtype=object), return_index=True, return_counts=True
+        )
+        self.students = nrps.tolist()
+        self._offsets = dict(zip(self.students, zip(starts.tolist(), (starts + counts).tolist())))
+    
+    def history(self, nrp):
+        """Semua submission satu mahasiswa urut Date (view, tanpa scan/sort ulang)"""
+        start, stop = self._offsets.get(nrp, (0, 0))
+        return self.frame.iloc[start:stop]
+    
+    def __len__(self):
+        return len(self.students)
+
+class FilterIndex:
+    """Index untuk filter Custom Analytics: frame urut Date (range tanggal via binary search),
+    Status sebagai kode integer, dan LRU posisi baris hasil filter per kombinasi filter.
+    """
+    
+    def __init__(self, df):
+        self.frame = df if df['Date'].is_monotonic_increasing else df.sort_values('Date', kind='stable')
+        self._days = self.frame['Day'].array
+        self._status_codes = self.frame['Status'].cat.codes.to_numpy()
+        self._status_categories = self.frame['Status'].cat.categories
+        self._scores = self.frame['Nilai'].to_numpy()
+        self._results = SharedCache(FILTER_CACHE_SIZE)
+    
+    def date_bounds(self):
+        return self.frame['Date'].iloc[0], self.frame['Date'].iloc[-1]
+    
+    def _day_position(self, day, side):
+        return int(self._days.searchsorted(pd.Timestamp(day).tz_localize(self._days.tz), side=side))
+    
+    def _positions(self, statuses, min_score, max_score, date_range):
+        start, stop = 0, len(self.frame)
+        if date_range is not None:
+            start = self._day_position(date_range[0], 'left')
+            stop = max(start, self._day_position(date_range[1], 'right'))
+        
+        wanted = self._status_categories.get_indexer(list(statuses))
+        scores = self._scores[start:stop]
+        mask = (
+            np.isin(self._status_codes[start:stop], wanted[wanted >= 0])
+            & (scores >= min_score)
+            & (scores <= max_score)
+        )
+        return np.flatnonzero(mask) + start
+    
+    def filter(self, statuses, min_score, max_score, date_range=None):
+        """Baris dengan Status di statuses, min_score <= Nilai <= max_score dan tanggal di date_range (inklusif)"""
+        key = filter_key(statuses, min_score, max_score, date_range)
+        positions = self._results.get_or_compute(key, self._positions, *key)
+        return self.frame.take(positions)
+
+def filter_key(statuses, min_score, max_score, date_range=None):
+    """Key hashable untuk satu kombinasi filter Custom Analytics"""
+    return (tuple(sorted(statuses)), min_score, max_score, tuple(date_range) if date_range is not None else None)
+
+def calculate_attempt_sequences(student_index):
+    """Urutan attempt semua mahasiswa dalam satu pass (frame StudentIndex sudah urut NRP, Date; groupby sekali).
+    
+    Hasil:
+    - submissions: per submission -> NRP, Date, attempt_number, gap_hours (jeda dari attempt sebelumnya), Nilai, passed
+    - students: per mahasiswa -> attempts, attempts_to_pass, first_pass_date, avg_gap_hours, first_score, last_score, max_score, passed
+    """
+    ordered = student_index.frame[['NRP', 'Date', 'Nilai']]
+    passed = student_index.frame['Passed'].to_numpy()
+    grouped = ordered.groupby('NRP', observed=True, sort=False)
+    
+    submissions = pd.DataFrame({
+        'NRP': ordered['NRP'],
+        'Date': ordered['Date'],
+        'attempt_number': (grouped.cumcount() + 1).astype('int32'),
+        'gap_hours': grouped['Date'].diff().dt.total_seconds() / 3600,
+        'Nilai': ordered['Nilai'],
+        'passed': passed
+    })
+    
+    first_rows = ordered[submissions['attempt_number'] == 1].set_index('NRP')
+    last_rows = ordered[grouped.cumcount(ascending=False) == 0].set_index('NRP')
+    first_pass = submissions[passed].groupby('NRP', observed=True).first()
+    
+    students = pd.DataFrame(index=first_rows.index)
+    students['attempts'] = grouped.size()
+    students['attempts_to_pass'] = first_pass['attempt_number'].reindex(students.index)
+    students['first_pass_date'] = first_pass['Date'].reindex(students.index)
+    span_hours = (last_rows['Date'] - first_rows['Date']).dt.total_seconds() / 3600
+    students['avg_gap_hours'] = (span_hours / (students['attempts'] - 1)).where(students['attempts'] > 1)
+    students['first_score'] = first_rows['Nilai']
+    students['last_score'] = last_rows['Nilai']
+    students['max_score'] = grouped['Nilai'].max()
+    students['passed'] = students['attempts_to_pass'].notna()
+    
+    return {'submissions': submissions, 'students': students}
+
+def calculate_pass_predictions(attempt_sequences, student_index):
+    """Prediksi probabilitas lulus semua mahasiswa sekaligus.
+    
+    Regresi linear Nilai terhadap urutan attempt (x = attempt ke-1..n, mulai 0) dihitung closed-form dari
+    jumlah per grup (n, sum x, sum x^2, sum y, sum xy), lalu aturan probabilitasnya sama dengan versi
+    per-mahasiswa sebelumnya. Hanya submission yang punya Nilai yang dihitung (sama seperti scored di
+    partial aggregate). slope & intercept juga dipakai untuk prediksi nilai attempt berikutnya.
+    
+    Slope yang jatuh (hampir) tepat di batas aturan (0 atau 5) di-fit ulang dengan np.polyfit dari riwayat
+    mahasiswa itu (StudentIndex.history), karena pembulatan polyfit bisa memindahkan kategorinya.
+    """
+    submissions = attempt_sequences['submissions']
+    students = attempt_sequences['students']
+    
+    scored = submissions[submissions['Nilai'].notna()]
+    x = (scored['attempt_number'] - 1).astype('float64')
+    y = scored['Nilai'].astype('float64')
+    sums = pd.DataFrame({'NRP': scored['NRP'], 'n': 1.0, 'sx': x, 'sxx': x * x, 'sy': y, 'sxy': x * y}).groupby(
+        'NRP', observed=True, sort=False
+    ).sum().reindex(students.index, fill_value=0.0)
+    
+    n = sums['n']
+    denominator = (n * sums['sxx'] - sums['sx'] ** 2).where(n >= 2)
+    slope = (n * sums['sxy'] - sums['sx'] * sums['sy']) / denominator
+    avg_score = sums['sy'] / n.where(n > 0)
+    last_score = scored.groupby('NRP', observed=True, sort=False)['Nilai'].last().reindex(students.index).astype('float64')
+    
+    boundary = (np.isclose(slope, 0.0, rtol=0, atol=1e-9) | np.isclose(slope, 5.0, rtol=0, atol=1e-9)) & (last_score < 60)
+    for nrp in slope.index[boundary]:
+        scores = student_index.history(nrp)['Nilai'].to_numpy(dtype='float64')
+        attempts = np.flatnonzero(~np.isnan(scores))
+        slope[nrp] = np.polyfit(attempts, scores[attempts], 1)[0]
+    
+    probability = np.select(
+        [n < 2, last_score >= 60, slope > 5, slope > 0],
+        [50.0, 100.0, np.minimum(95.0, 50 + slope * 5), np.minimum(70.0, 40 + avg_score / 2)],
+        default=np.maximum(20.0, avg_score / 2)
+    )
+    
+    predictions = pd.DataFrame({
+        'slope': slope,
+        'intercept': (sums['sy'] - slope * sums['sx']) / n,
+        'avg_score': avg_score,
+        'Probability': probability
+    }, index=students.index)
+    predictions['Risk Category'] = np.select(
+        [predictions['Probability'] >= 70, predictions['Probability'] >= 40],
+        ['🟢 Low Risk', '🟡 Medium Risk'],
+        default='🔴 High Risk'
+    )
+    return predictions
+
+def calculate_student_matrix(partials):
+    """Matrix mahasiswa x assignment: max score (typed) dan flag lulus per assignment, plus Total Passed.
+    
+    Disusun dari partial aggregate per mahasiswa tiap assignment (tanpa concat frame); sel kosong (NA)
+    berarti mahasiswa belum submit assignment tersebut.
+    """
+    assignments = list(partials)
+    per_student = pd.concat(
+        {assignment: partial['students'][['max_score', 'passes']] for assignment, partial in partials.items()},
+        names=['Assignment', 'NRP']
+    )
+    scores = per_student['max_score'].unstack('Assignment').reindex(columns=assignments)
+    passed = (per_student['passes'] > 0).unstack('Assignment').reindex(columns=assignments)
+    integral = all(partial['students']['max_score'].dtype == 'int16' for partial in partials.values())
+    score_dtype = 'Int16' if integral else 'Float64'
+    
+    matrix = pd.DataFrame(index=scores.index)
+    for assignment in assignments:
+        matrix[f"{assignment} - Score"] = scores[assignment].astype(score_dtype)
+        matrix[f"{assignment} - Status"] = passed[assignment].astype('boolean')
+    matrix['Total Passed'] = passed.fillna(False).astype(bool).sum(axis=1).astype('int16')
+    
+    return matrix.sort_values('Total Passed', ascending=False, kind='stable').reset_index()
+
+def calculate_partial_aggregates(df):
+    """Aggregate satu assignment yang bisa digabung secara aljabar (lihat merge_partial_aggregates).
+    
+    Total: rows, passes, scored (Nilai tidak kosong), score_sum.
+    students (index NRP): rows, passes, scored, score_sum, max_score, last_submission.
+    score_counts: jumlah submission per nilai (untuk histogram & box plot tanpa kirim data per baris).
+    """
+    if not {'NRP', 'Date', 'Nilai', 'Passed'}.issubset(df.columns):
+        # Sheet kosong / tanpa kolom wajib: partial kosong yang tetap bisa digabung
+        df = pd.DataFrame({
+            'NRP': pd.Series(dtype='category'),
+            'Date': pd.Series(dtype='datetime64[ns, UTC]'),
+            'Nilai': pd.Series(dtype='float64'),
+            'Passed': pd.Series(dtype=bool)
+        })
+    
+    scores = df['Nilai'].astype('float64')
+    parts = pd.DataFrame({
+        'NRP': df['NRP'],
+        'passes': df['Passed'].astype(np.int64),
+        'scored': scores.notna().astype(np.int64),
+        'score_sum': scores.fillna(0.0),
+        'Nilai': df['Nilai'],
+        'Date': df['Date']
+    })
+    students = parts.groupby('NRP', observed=True).agg(
+        rows=('passes', 'size'),
+        passes=('passes', 'sum'),
+        scored=('scored', 'sum'),
+        score_sum=('score_sum', 'sum'),
+        max_score=('Nilai', 'max'),
+        last_submission=('Date', 'max')
+    )
+    return {
+        'rows': len(parts),
+        'passes': int(parts['passes'].sum()),
+        'scored': int(parts['scored'].sum()),
+        'score_sum': float(parts['score_sum'].sum()),
+        'students': students,
+        'score_counts': score_value_counts(df['Nilai'])
+    }
+
+def merge_partial_aggregates(partials):
+    """Gabungkan partial aggregate beberapa assignment: total dijumlah, per mahasiswa sum/max"""
+    partials = list(partials)
+    if len(partials) == 1:
+        return partials[0]
+    
+    students = pd.concat([partial['students'] for partial in partials]).groupby(level='NRP').agg({
+        'rows': 'sum',
+        'passes': 'sum',
+        'scored': 'sum',
+        'score_sum': 'sum',
+        'max_score': 'max',
+        'last_submission': 'max'
+    })
+    merged = {key: sum(partial[key] for partial in partials) for key in ('rows', 'passes', 'scored', 'score_sum')}
+    merged['students'] = students
+    merged['score_counts'] = merge_score_counts(partial['score_counts'] for partial in partials)
+    return merged
+
+def calculate_metrics(partials):
+    """Calculate various metrics from partial aggregates (satu assignment atau gabungan)"""
     metrics = {}
     
     # Basic metrics
-    metrics['total_submissions'] = len(df)
-    metrics['unique_students'] = df['NRP'].nunique()
-    metrics['pass_rate'] = (df['Status'] == 'Lulus').sum() / len(df) * 100 if len(df) > 0 else 0
-    metrics['avg_score'] = df['Nilai'].mean() if len(df) > 0 else 0
+    rows = partials['rows']
+    metrics['total_submissions'] = rows
+    metrics['unique_students'] = len(partials['students'])
+    metrics['pass_rate'] = partials['passes'] / rows * 100 if rows > 0 else 0
+    metrics['avg_score'] = partials['score_sum'] / partials['scored'] if partials['scored'] > 0 else 0
     
     # Student-level metrics
-    student_stats = df.groupby('NRP').agg({
-        'Nilai': ['mean', 'max', 'count'],
-        'Status': lambda x: (x == 'Lulus').any()
-    }).reset_index()
-    student_stats.columns = ['NRP', 'avg_score', 'max_score', 'attempts', 'passed']
+    students = partials['students']
+    student_stats = pd.DataFrame({
+        'avg_score': students['score_sum'] / students['scored'],
+        'max_score': students['max_score'],
+        'attempts': students['scored'],
+        'passed': students['passes'] > 0
+    }).rename_axis('NRP').reset_index()
     
     metrics['students_passed'] = student_stats['passed'].sum()
     metrics['students_not_passed'] = len(student_stats) - metrics['students_passed']
@@ -389,15 +1633,181 @@ def calculate_metrics(df):
     
     return metrics
 
-def plot_score_distribution(df):
-    """Plot score distribution"""
-    fig = px.histogram(
-        df, 
-        x='Nilai', 
-        nbins=20,
-        title='Distribusi Nilai',
-        color_discrete_sequence=['#1f77b4']
-    )
+
+class AnalyticsView:
+    """Dependency graph analitik untuk satu view (satu assignment atau gabungan beberapa assignment).
+    
+    Node (ANALYTICS_NODES) baru dihitung saat diminta halaman, beserta dependency-nya, lalu di-cache di
+    ANALYTICS_CACHE per (nama node, versi data): halaman hanya membayar node yang ditampilkan, dan node
+    yang dipakai banyak halaman/session dihitung sekali per versi data.
+    """
+    
+    def __init__(self, snapshots, assignments):
+        self.snapshots = snapshots
+        self.assignments = list(assignments)
+        if len(self.assignments) == 1:
+            self.version = snapshots[self.assignments[0]].fingerprint
+        else:
+            self.version = combine_fingerprints(snapshots[assignment].fingerprint for assignment in self.assignments)
+    
+    @property
+    def rows(self):
+        return sum(len(self.snapshots[assignment].frame) for assignment in self.assignments)
+    
+    @property
+    def loaded_at(self):
+        return min(self.snapshots[assignment].loaded_at for assignment in self.assignments)
+    
+    def assignment_views(self):
+        """View per assignment, dasar node view gabungan yang bisa digabung (partials, rollups)"""
+        return [AnalyticsView(self.snapshots, [assignment]) for assignment in self.assignments]
+    
+    def node(self, name):
+        """Hasil node name untuk view ini"""
+        if name == "frame" and len(self.assignments) == 1:
+            return self.snapshots[self.assignments[0]].frame
+        
+        return ANALYTICS_CACHE.get_or_compute((name, self.version), self._build, name)
+    
+    def _build(self, name):
+        # Dependency di-resolve lewat node() juga, jadi yang sudah ada di cache tidak dihitung ulang
+        build, dependencies = ANALYTICS_NODES[name]
+        return build(*[self if dependency == "view" else self.node(dependency) for dependency in dependencies])
+
+def build_view_frame(view):
+    """Frame row-level view gabungan, hanya dibuat kalau ada halaman yang butuh data per baris"""
+    return combine_dataframes({assignment: view.snapshots[assignment].frame for assignment in view.assignments})
+
+def build_view_partials(view):
+    """Partial aggregate view: dihitung dari frame untuk satu assignment, digabung untuk view gabungan"""
+    if len(view.assignments) == 1:
+        return calculate_partial_aggregates(view.node("frame"))
+    return merge_partial_aggregates(assignment_view.node("partials") for assignment_view in view.assignment_views())
+
+def build_view_rollups(view):
+    """Rollup waktu view: rollup snapshot per assignment yang dijumlahkan"""
+    return merge_rollups(view.snapshots[assignment].rollups for assignment in view.assignments)
+
+def build_assignment_partials(view):
+    """Partial aggregate tiap assignment di view, urut sesuai pilihan"""
+    return {
+        assignment_view.assignments[0]: assignment_view.node("partials")
+        for assignment_view in view.assignment_views()
+    }
+
+# Node analitik: nama -> (fungsi, dependency). "view" = AnalyticsView itu sendiri (untuk node sumber).
+ANALYTICS_NODES = {
+    "frame": (build_view_frame, ("view",)),
+    "partials": (build_view_partials, ("view",)),
+    "rollups": (build_view_rollups, ("view",)),
+    "metrics": (calculate_metrics, ("partials",)),
+    "student_index": (StudentIndex, ("frame",)),
+    "attempt_sequences": (calculate_attempt_sequences, ("student_index",)),
+    "pass_predictions": (calculate_pass_predictions, ("attempt_sequences", "student_index")),
+    "filter_index": (FilterIndex, ("frame",)),
+    "assignment_partials": (build_assignment_partials, ("view",)),
+    "student_matrix": (calculate_student_matrix, ("assignment_partials",)),
+}
+
+def score_value_counts(scores):
+    """Jumlah submission per nilai, urut nilai (nilai kosong tidak dihitung)"""
+    return scores.value_counts().sort_index()
+
+def score_value_counts_by(df, column):
+    """score_value_counts per nilai unik kolom (misal per Status), dalam satu groupby"""
+    counts = df.groupby(column, observed=True)['Nilai'].value_counts().sort_index()
+    return {group: group_counts.droplevel(column) for group, group_counts in counts.groupby(level=column, observed=True)}
+
+def merge_score_counts(counts):
+    """Gabungkan value counts nilai dari beberapa assignment"""
+    counts = list(counts)
+    if len(counts) == 1:
+        return counts[0]
+    return pd.concat(counts).groupby(level=0).sum()
+
+def score_histogram(counts, nbins=SCORE_HISTOGRAM_BINS):
+    """(edges, jumlah per bin) dengan nbins bin sama lebar antara nilai terkecil dan terbesar"""
+    values = counts.index.to_numpy(dtype='float64')
+    if len(values) == 0:
+        return np.array([0.0, 1.0]), np.array([0])
+    edges = np.histogram_bin_edges(values[[0, -1]], bins=nbins)
+    hist, _ = np.histogram(values, bins=edges, weights=counts.to_numpy())
+    return edges, hist.astype(np.int64)
+
+def score_box_summary(counts):
+    """Five-number summary dari value counts nilai: q1, median, q3 (interpolasi linear),
+    fence = nilai terjauh dalam 1.5 IQR (seperti whisker Plotly), outliers = nilai di luar fence.
+    """
+    values = counts.index.to_numpy(dtype='float64')
+    cumulative = np.cumsum(counts.to_numpy())
+    
+    def quantile(q):
+        position = (cumulative[-1] - 1) * q
+        lower = values[np.searchsorted(cumulative, np.floor(position) + 1)]
+        upper = values[np.searchsorted(cumulative, np.ceil(position) + 1)]
+        return lower + (position - np.floor(position)) * (upper - lower)
+    
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': inside.min(),
+        'upperfence': inside.max(),
+        'outliers': values[(values < inside.min()) | (values > inside.max())]
+    }
+
+def plot_score_histogram(counts, title, color=None):
+    """Histogram nilai dari value counts (hanya SCORE_HISTOGRAM_BINS bar yang dikirim ke browser)"""
+    edges, hist = score_histogram(counts)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=hist,
+        width=np.diff(edges),
+        marker_color=color,
+        hovertemplate='Nilai %{customdata[0]:.4g} - %{customdata[1]:.4g}<br>Jumlah: %{y}<extra></extra>',
+        customdata=np.column_stack([edges[:-1], edges[1:]])
+    ))
+    fig.update_layout(title=title, bargap=0, xaxis_title='Nilai', yaxis_title='count')
+    return fig
+
+def plot_score_boxes(counts_by_group, title, group_title):
+    """Box plot nilai per grup dari five-number summary (plus titik outlier per nilai unik)"""
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for idx, (group, counts) in enumerate(counts_by_group.items()):
+        if counts.empty:
+            continue
+        summary = score_box_summary(counts)
+        color = palette[idx % len(palette)]
+        fig.add_trace(go.Box(
+            x=[group],
+            q1=[summary['q1']],
+            median=[summary['median']],
+            q3=[summary['q3']],
+            lowerfence=[summary['lowerfence']],
+            upperfence=[summary['upperfence']],
+            name=str(group),
+            marker_color=color,
+            boxpoints=False
+        ))
+        if len(summary['outliers']) > 0:
+            fig.add_trace(go.Scatter(
+                x=[group] * len(summary['outliers']),
+                y=summary['outliers'],
+                mode='markers',
+                name=str(group),
+                marker_color=color,
+                showlegend=False
+            ))
+    fig.update_layout(title=title, xaxis_title=group_title, yaxis_title='Nilai', showlegend=False)
+    return fig
+
+def plot_score_distribution(score_counts):
+    """Plot score distribution (dari value counts nilai)"""
+    fig = plot_score_histogram(score_counts, 'Distribusi Nilai', color='#1f77b4')
     fig.update_layout(
         xaxis_title='Nilai',
         yaxis_title='Jumlah Submission',
@@ -405,9 +1815,55 @@ def plot_score_distribution(df):
     )
     return fig
 
-def plot_submission_timeline(df):
-    """Plot submission timeline"""
-    daily_submissions = df.groupby(df['Date'].dt.date).size().reset_index()
+def bucket_by_time(frame, max_points=MAX_POINTS_PER_TRACE):
+    """Gabung rollup harian (index tanggal, kolom additive termasuk count) ke bucket N hari
+    supaya jumlah titik tidak lebih dari max_points; bucket tanpa submission dibuang.
+    """
+    if len(frame) <= max_points:
+        return frame
+    span_days = (frame.index[-1] - frame.index[0]).days + 1
+    bucket_days = -(-span_days // max_points)
+    bucketed = frame.resample(f"{bucket_days}D").sum()
+    return bucketed[bucketed['count'] > 0]
+
+def lttb_indices(x, y, threshold=MAX_POINTS_PER_TRACE):
+    """Index titik hasil downsampling Largest-Triangle-Three-Buckets (titik pertama & terakhir selalu ikut)"""
+    n = len(x)
+    if n <= threshold or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # threshold - 2 bucket di antara titik pertama dan terakhir
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    selected = [0]
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = np.nanmean(y[stop:next_stop]) if np.isfinite(y[stop:next_stop]).any() else 0.0
+        
+        prev = selected[-1]
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        selected.append(start + int(np.argmax(np.nan_to_num(area, nan=-1.0))))
+    selected.append(n - 1)
+    return np.asarray(selected)
+
+def render_mode(points):
+    """Render mode Plotly Express: WebGL kalau titiknya di atas WEBGL_POINT_THRESHOLD"""
+    return 'webgl' if points > WEBGL_POINT_THRESHOLD else 'svg'
+
+def line_trace(x, y, **kwargs):
+    """go.Scatter, atau go.Scattergl (WebGL) kalau titiknya di atas WEBGL_POINT_THRESHOLD"""
+    trace_type = go.Scattergl if len(x) > WEBGL_POINT_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+def plot_submission_timeline(rollups):
+    """Plot submission timeline (dari rollup harian, di-bucket kalau rentangnya panjang)"""
+    daily_submissions = bucket_by_time(rollups['day'][['count']]).reset_index()
     daily_submissions.columns = ['Date', 'Count']
     
     fig = px.line(
@@ -415,7 +1871,8 @@ def plot_submission_timeline(df):
         x='Date',
         y='Count',
         title='Timeline Submission',
-        markers=True
+        markers=True,
+        render_mode=render_mode(len(daily_submissions))
     )
     fig.update_layout(
         xaxis_title='Tanggal',
@@ -423,12 +1880,9 @@ def plot_submission_timeline(df):
     )
     return fig
 
-def plot_pass_rate_by_student(df):
-    """Plot pass rate by student"""
-    student_pass = df.groupby('NRP').agg({
-        'Status': lambda x: (x == 'Lulus').sum() / len(x) * 100
-    }).reset_index()
-    student_pass.columns = ['NRP', 'Pass Rate']
+def plot_pass_rate_by_student(students):
+    """Plot pass rate by student (students = partial aggregate per mahasiswa)"""
+    student_pass = (students['passes'] / students['rows'] * 100).rename('Pass Rate').rename_axis('NRP').reset_index()
     student_pass = student_pass.sort_values('Pass Rate', ascending=True)
 
     fig = px.bar(
@@ -453,18 +1907,14 @@ def plot_pass_rate_by_student(df):
     )
     return fig
 
-def plot_submission_heatmap(df):
-    """Plot submission heatmap by hour and day"""
-    df['Hour'] = df['Date'].dt.hour
-    df['DayOfWeek'] = df['Date'].dt.day_name()
+def plot_submission_heatmap(rollups):
+    """Plot submission heatmap by hour and day (dari rollup weekday x hour)"""
+    heatmap_pivot = rollups['weekday_hour']['count'].unstack('Hour', fill_value=0)
     
-    heatmap_data = df.groupby(['DayOfWeek', 'Hour']).size().reset_index()
-    heatmap_data.columns = ['DayOfWeek', 'Hour', 'Count']
-    
-    # Order days
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    heatmap_pivot = heatmap_data.pivot(index='DayOfWeek', columns='Hour', values='Count').fillna(0)
-    heatmap_pivot = heatmap_pivot.reindex(day_order)
+    # Kode Weekday 0..6 -> nama hari, urut Senin..Minggu
+    heatmap_pivot = heatmap_pivot.reindex(range(len(DAY_NAMES)))
+    heatmap_pivot.index = DAY_NAMES
+    heatmap_pivot.index.name = 'DayOfWeek'
     
     fig = px.imshow(
         heatmap_pivot,
@@ -474,18 +1924,10 @@ def plot_submission_heatmap(df):
     )
     return fig
 
-def plot_attempts_before_pass(df):
-    """Plot number of attempts before passing"""
-    passed_students = df[df['Status'] == 'Lulus'].groupby('NRP').first().reset_index()
-    
-    attempts_data = []
-    for nrp in passed_students['NRP']:
-        student_data = df[df['NRP'] == nrp].sort_values('Date')
-        first_pass_date = student_data[student_data['Status'] == 'Lulus']['Date'].iloc[0]
-        attempts_before_pass = len(student_data[student_data['Date'] <= first_pass_date])
-        attempts_data.append({'NRP': nrp, 'Attempts': attempts_before_pass})
-    
-    attempts_df = pd.DataFrame(attempts_data)
+def plot_attempts_before_pass(student_attempts):
+    """Plot number of attempts before passing (dari attempt-sequence engine)"""
+    attempts_df = student_attempts['attempts_to_pass'].dropna().astype(int).reset_index()
+    attempts_df.columns = ['NRP', 'Attempts']
     
     fig = px.histogram(
         attempts_df,
@@ -499,13 +1941,16 @@ def plot_attempts_before_pass(df):
     )
     return fig
 
-def plot_score_progress(df, nrp):
-    """Plot score progress for a specific student"""
-    student_data = df[df['NRP'] == nrp].sort_values('Date')
+def plot_score_progress(student_data, nrp):
+    """Plot score progress for a specific student (student_data = StudentIndex.history, di-downsample LTTB)"""
+    timestamps = student_data['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    keep = lttb_indices(timestamps, student_data['Nilai'].to_numpy(dtype='float64'))
+    if len(keep) < len(student_data):
+        student_data = student_data.iloc[keep]
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(line_trace(
         x=student_data['Date'],
         y=student_data['Nilai'],
         mode='lines+markers',
@@ -526,68 +1971,409 @@ def plot_score_progress(df, nrp):
     
     return fig
 
-def predict_pass_probability(df, nrp):
-    """Simple prediction of pass probability based on attempt pattern"""
-    student_data = df[df['NRP'] == nrp].sort_values('Date')
+def plot_success_by_attempt(submissions):
+    """Plot persentase lulus per urutan attempt"""
+    success_by_attempt = (submissions.groupby('attempt_number')['passed'].mean() * 100).reset_index()
+    success_by_attempt.columns = ['Attempt', 'Success Rate']
     
-    if len(student_data) < 2:
-        return 50.0
+    return px.line(success_by_attempt, x='Attempt', y='Success Rate',
+                   title='Success Rate per Attempt',
+                   markers=True)
+
+def plot_daily_trend(rollups):
+    """Plot trend harian pass rate & rata-rata nilai (dari rollup harian)"""
+    day_rollup = bucket_by_time(rollups['day'])
+    daily_stats = pd.DataFrame({
+        'Pass Rate': day_rollup['passes'] / day_rollup['count'] * 100,
+        'Avg Score': day_rollup['score_sum'] / day_rollup['scored']
+    }).rename_axis('Date').reset_index()
+    
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    fig.add_trace(
+        line_trace(x=daily_stats['Date'], y=daily_stats['Pass Rate'],
+                  name='Pass Rate', line=dict(color='green')),
+        secondary_y=False
+    )
     
-    scores = student_data['Nilai'].values
+    fig.add_trace(
+        line_trace(x=daily_stats['Date'], y=daily_stats['Avg Score'],
+                  name='Avg Score', line=dict(color='blue')),
+        secondary_y=True
+    )
+    
+    fig.update_layout(title='Trend Harian: Pass Rate & Rata-rata Nilai')
+    fig.update_xaxes(title_text='Tanggal')
+    fig.update_yaxes(title_text='Pass Rate (%)', secondary_y=False)
+    fig.update_yaxes(title_text='Rata-rata Nilai', secondary_y=True)
+    return fig
+
+def plot_next_attempt_forecast(scores, trend_line, predicted_score, nrp):
+    """Plot nilai aktual, garis tren dan prediksi nilai attempt berikutnya"""
     attempts = np.arange(len(scores))
+    next_attempt = len(scores)
     
-    if len(scores) > 1:
-        slope = np.polyfit(attempts, scores, 1)[0]
-        avg_score = scores.mean()
-        last_score = scores[-1]
-        
-        if last_score >= 60:
-            return 100.0
-        elif slope > 5:
-            return min(95.0, 50 + slope * 5)
-        elif slope > 0:
-            return min(70.0, 40 + avg_score / 2)
-        else:
-            return max(20.0, avg_score / 2)
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=attempts + 1,
+        y=scores,
+        mode='markers',
+        name='Actual',
+        marker=dict(size=10, color='blue')
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=np.arange(0, next_attempt + 2),
+        y=trend_line(np.arange(0, next_attempt + 2)),
+        mode='lines',
+        name='Trend',
+        line=dict(dash='dash', color='gray')
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=[next_attempt + 1],
+        y=[predicted_score],
+        mode='markers',
+        name='Predicted',
+        marker=dict(size=15, color='red', symbol='star')
+    ))
+    
+    fig.update_layout(
+        title=f'Prediksi untuk {nrp}',
+        xaxis_title='Attempt',
+        yaxis_title='Nilai'
+    )
+    return fig
+
+def plot_custom_visualization(filtered_df, viz_type, attempt_numbers=None):
+    """Chart Custom Analytics untuk data hasil filter.
+    
+    attempt_numbers (per baris view, dari node attempt_sequences) dipakai Scatter Plot supaya urutan
+    attempt sama dengan halaman Pattern Submission (lintas assignment di view gabungan).
+    """
+    if viz_type == "Score Distribution":
+        return plot_score_histogram(score_value_counts(filtered_df['Nilai']), 'Distribusi Nilai (Filtered)')
+    
+    if viz_type == "Timeline":
+        timeline_data = bucket_by_time(filtered_df.groupby('Day').size().to_frame('count')).reset_index()
+        timeline_data.columns = ['Date', 'Count']
+        return px.line(timeline_data, x='Date', y='Count', 
+                       title='Timeline Submission (Filtered)', markers=True,
+                       render_mode=render_mode(len(timeline_data)))
+    
+    if viz_type == "Box Plot":
+        return plot_score_boxes(
+            score_value_counts_by(filtered_df, 'Status'),
+            'Box Plot Nilai per Status (Filtered)',
+            'Status'
+        )
+    
+    if viz_type == "Scatter Plot":
+        scatter_df = filtered_df.assign(**{'Attempt Number': attempt_numbers.reindex(filtered_df.index)})
+        return px.scatter(scatter_df, x='Attempt Number', y='Nilai',
+                          color='Status', title='Scatter: Attempt vs Nilai (Filtered)')
+    
+    numeric_cols = ['Nilai', 'Hour', 'Weekday']
+    corr_matrix = filtered_df[numeric_cols].rename(columns={'Weekday': 'DayOfWeek'}).corr()
+    
+    return px.imshow(corr_matrix, 
+                     title='Correlation Matrix',
+                     labels=dict(color="Correlation"),
+                     color_continuous_scale='RdBu')
+
+# --- FRAGMENTS ---
+# Section dengan widget interaktif dijalankan sebagai fragment: mengganti pilihan di dalamnya hanya
+# me-rerun section itu (tanpa sidebar, load data dan chart lain di halaman)
+@st.fragment
+def student_performance_section(view, figure_scope):
+    """Detail satu mahasiswa di Analisis Performa, dipilih lewat selectbox"""
+    student_index = view.node("student_index")
+    selected_student = st.selectbox("Pilih Mahasiswa:", student_index.students)
+    
+    student_df = student_index.history(selected_student)
+    student_attempts = view.node("attempt_sequences")['students'].loc[selected_student]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Attempt", len(student_df))
+    
+    with col2:
+        st.metric("Nilai Tertinggi", student_df['Nilai'].max())
+    
+    with col3:
+        st.metric("Nilai Rata-rata", f"{student_df['Nilai'].mean():.1f}")
+    
+    with col4:
+        passed = (student_df['Status'] == 'Lulus').any()
+        st.metric("Status", "✅ Lulus" if passed else "❌ Belum Lulus")
+    
+    st.divider()
+    
+    st.plotly_chart(
+        get_figure(figure_scope + ('score_progress', selected_student), plot_score_progress, student_df, selected_student),
+        use_container_width=True
+    )
+    
+    st.divider()
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.subheader("📝 Riwayat Submission")
+        display_df = student_df[['Date', 'Nilai', 'Status']].copy()
+        display_df['Date'] = display_df['Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.subheader("📊 Statistik")
+    
+        if len(student_df) > 1:
+            first_score = student_df['Nilai'].iloc[0]
+            last_score = student_df['Nilai'].iloc[-1]
+            improvement = last_score - first_score
+    
+            st.metric("Peningkatan", f"{improvement:+.0f}", 
+                     delta=f"{improvement:+.0f} poin")
+    
+        if len(student_df) > 1:
+            st.metric("Rata-rata Jeda", f"{student_attempts['avg_gap_hours']:.1f} jam")
+    
+        if passed:
+            st.metric("Lulus di Attempt ke-", int(student_attempts['attempts_to_pass']))
+
+@st.fragment
+def prediction_detail_section(pred_df):
+    """Tabel detail prediksi dengan filter risk/status"""
+    filter_option = st.radio(
+        "Filter:",
+        ["Semua", "High Risk Only", "Belum Lulus Only"]
+    )
+    
+    filtered_pred = pred_df.copy()
+    if filter_option == "High Risk Only":
+        filtered_pred = filtered_pred[filtered_pred['Risk Category'] == '🔴 High Risk']
+    elif filter_option == "Belum Lulus Only":
+        filtered_pred = filtered_pred[filtered_pred['Status'] == '❌ Belum Lulus']
+    
+    st.dataframe(filtered_pred, use_container_width=True, hide_index=True)
+
+@st.fragment
+def next_attempt_section(view, nrps, predictions, figure_scope):
+    """Prediksi nilai attempt berikutnya untuk mahasiswa yang dipilih"""
+    selected_student = st.selectbox(
+        "Pilih mahasiswa untuk prediksi:",
+        nrps
+    )
+    
+    student_history = view.node("student_index").history(selected_student)
+    # Garis tren dari batch scorer (regresi yang sama dengan prediksi probabilitas); slope kosong
+    # kalau mahasiswa punya kurang dari 2 submission bernilai
+    trend = predictions.loc[selected_student]
+    
+    if len(student_history) >= 2 and pd.notna(trend['slope']):
+        scores = student_history['Nilai'].values
+        last_score = student_history['Nilai'].dropna().iloc[-1]
+    
+        p = np.poly1d([trend['slope'], trend['intercept']])
+    
+        next_attempt = len(scores)
+        predicted_score = p(next_attempt)
+        predicted_score = max(0, min(100, predicted_score))
+    
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            st.metric(
+                "Prediksi Nilai Next Attempt",
+                f"{predicted_score:.0f}",
+                delta=f"{predicted_score - last_score:+.0f} dari attempt terakhir"
+            )
+    
+            if predicted_score >= 60:
+                st.success("✅ Diprediksi akan lulus di attempt berikutnya!")
+            else:
+                st.warning("⚠️ Mungkin perlu attempt tambahan")
+    
+        with col2:
+            fig = get_figure(
+                figure_scope + ('forecast', selected_student),
+                plot_next_attempt_forecast,
+                scores,
+                p,
+                predicted_score,
+                selected_student
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("ℹ️ Tidak cukup data untuk membuat prediksi (minimal 2 attempt)")
+
+@st.fragment
+def custom_analytics_section(view, figure_scope):
+    """Filter, visualisasi, export dan preview Custom Analytics"""
+    df = view.node("frame")
+    st.subheader("🔍 Custom Filters")
+    
+    filter_index = view.node("filter_index")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        status_filter = st.multiselect(
+            "Status:",
+            options=df['Status'].unique(),
+            default=df['Status'].unique()
+        )
+    
+    with col2:
+        min_score = st.number_input("Nilai Minimum:", 0, 100, 0)
+        max_score = st.number_input("Nilai Maximum:", 0, 100, 100)
+    
+    with col3:
+        date_range = st.date_input(
+            "Rentang Tanggal:",
+            value=filter_index.date_bounds()
+        )
+    
+    # Tanggal baru dipakai kalau range lengkap (user bisa baru memilih tanggal awal)
+    active_date_range = date_range if len(date_range) == 2 else None
+    filtered_df = filter_index.filter(status_filter, min_score, max_score, active_date_range)
+    
+    st.success(f"✅ {len(filtered_df)} records setelah filtering")
+    
+    st.divider()
+    
+    st.subheader("📊 Custom Visualizations")
+    
+    viz_type = st.selectbox(
+        "Pilih Tipe Visualisasi:",
+        ["Score Distribution", "Timeline", "Box Plot", "Scatter Plot", "Correlation"]
+    )
+    
+    fig = get_figure(
+        figure_scope + ('custom', viz_type, filter_key(status_filter, min_score, max_score, active_date_range)),
+        plot_custom_visualization,
+        filtered_df,
+        viz_type,
+        view.node("attempt_sequences")['submissions']['attempt_number'] if viz_type == "Scatter Plot" else None
+    )
+    st.plotly_chart(fig, use_container_width=True)
     
-    return 50.0
+    st.divider()
+    
+    st.subheader("📥 Export Data")
+    
+    # File export baru dibuat saat tombol diklik (bukan di setiap rerun)
+    export_format = st.radio("Format Export:", list(EXPORT_FORMATS), horizontal=True)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        export_button(
+            "📄 Download Filtered Data",
+            ("filtered", view.version, filter_key(status_filter, min_score, max_score, active_date_range)),
+            filtered_df.drop(columns=DERIVED_COLUMNS),
+            export_format,
+            "filtered_data"
+        )
+    
+    with col2:
+        export_button(
+            "📊 Download Summary Stats",
+            ("summary", view.version),
+            view.node("metrics")['student_stats'],
+            export_format,
+            "summary_stats"
+        )
+    
+    with col3:
+        export_button(
+            "💾 Download Full Dataset",
+            ("full", view.version),
+            df.drop(columns=DERIVED_COLUMNS),
+            export_format,
+            "full_data"
+        )
+    
+    st.divider()
+    
+    st.subheader("📋 Filtered Data Preview")
+    st.dataframe(filtered_df.drop(columns=DERIVED_COLUMNS), use_container_width=True)
+    
+    st.subheader("📈 Statistics (Filtered Data)")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Records", len(filtered_df))
+    
+    with col2:
+        st.metric("Unique Students", filtered_df['NRP'].nunique())
+    
+    with col3:
+        st.metric("Avg Score", f"{filtered_df['Nilai'].mean():.1f}")
+    
+    with col4:
+        pass_rate = (filtered_df['Status'] == 'Lulus').sum() / len(filtered_df) * 100 if len(filtered_df) > 0 else 0
+        st.metric("Pass Rate", f"{pass_rate:.1f}%")
 
 # Main content based on selected page
 if selected_assignments:
     # Load data for selected assignments
-    with st.spinner("Loading data from Google Sheets..."):
-        all_data = load_multiple_sheets(st.session_state.creds, selected_assignments)
+    with st.spinner(f"Loading data from {DATA_SOURCE.label}..."):
+        snapshots = load_multiple_sheets(st.session_state.creds, selected_assignments)
     
-    if not all_data:
+    if not snapshots:
         st.error("❌ Tidak ada data yang berhasil dimuat")
         st.info("Pastikan:\n1. Google Sheets sudah di-share ke service account email\n2. Sheet memiliki data yang valid\n3. Format data sesuai (kolom: NRP, Date, Nilai, Status)")
         st.stop()
     
-    # Determine which dataframe to use
+    # Determine which assignments are in the current view
     if len(selected_assignments) == 1:
-        df = all_data[selected_assignments[0]]
         current_assignment = selected_assignments[0]
+        view_assignments = [current_assignment]
     else:
         if view_mode == "Combined":
-            df = combine_dataframes(all_data)
             current_assignment = "Combined View"
+            view_assignments = list(snapshots)
         else:
             current_assignment = st.selectbox(
                 "Lihat assignment:",
                 selected_assignments
             )
-            df = all_data[current_assignment]
+            view_assignments = [current_assignment]
+    view_assignments = [assignment for assignment in view_assignments if assignment in snapshots]
+    
+    # Node analitik (metrics, rollups, prediksi, ...) baru dihitung oleh halaman yang menampilkannya
+    view = AnalyticsView(snapshots, view_assignments) if view_assignments else None
     
-    if df is not None and not df.empty:
-        # Show current view info
-        st.info(f"📊 Viewing: **{current_assignment}** | Total Records: **{len(df):,}** | Last Updated: **{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**")
+    if view is not None and view.rows > 0:
+        data_version = view.version
         
-        metrics = calculate_metrics(df)
+        # Show current view info (waktu snapshot, bukan waktu rerun)
+        snapshot_time = view.loaded_at
+        st.info(
+            f"📊 Viewing: **{current_assignment}** | Total Records: **{view.rows:,}** | "
+            f"Last Updated: **{datetime.fromtimestamp(snapshot_time).strftime('%Y-%m-%d %H:%M:%S')}** "
+            f"({format_age(time.time() - snapshot_time)})"
+        )
+        
+        refresh_errors = [a for a in view_assignments if DATASET_STORE.last_error(a) is not None]
+        if refresh_errors:
+            st.warning(f"⚠️ Refresh gagal untuk {', '.join(refresh_errors)}, menampilkan data terakhir yang berhasil dimuat")
+        
+        # Prefix key FIGURE_CACHE untuk chart di halaman ini
+        figure_scope = (data_version, tuple(view_assignments), page)
         
         # PAGE: OVERVIEW
         if page == "Overview":
             st.header("📊 Overview Dashboard")
             
+            metrics = view.node("metrics")
+            partials = view.node("partials")
+            rollups = view.node("rollups")
+            
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
@@ -623,10 +2409,16 @@ if selected_assignments:
             col1, col2 = st.columns(2)
             
             with col1:
-                st.plotly_chart(plot_score_distribution(df), use_container_width=True)
+                st.plotly_chart(
+                    get_figure(figure_scope + ('score_distribution',), plot_score_distribution, partials['score_counts']),
+                    use_container_width=True
+                )
             
             with col2:
-                st.plotly_chart(plot_submission_timeline(df), use_container_width=True)
+                st.plotly_chart(
+                    get_figure(figure_scope + ('timeline',), plot_submission_timeline, rollups),
+                    use_container_width=True
+                )
             
             st.subheader("👥 Status Mahasiswa")
             col1, col2 = st.columns(2)
@@ -652,10 +2444,7 @@ if selected_assignments:
             
             st.subheader("🏆 Leaderboard")
             
-            leaderboard = df.groupby('NRP').agg({
-                'Nilai': 'max',
-                'Date': 'max'
-            }).reset_index()
+            leaderboard = view.node("partials")['students'][['max_score', 'last_submission']].reset_index()
             leaderboard.columns = ['NRP', 'Nilai Tertinggi', 'Last Submission']
             leaderboard = leaderboard.sort_values(
                 ['Nilai Tertinggi', 'Last Submission'],
@@ -672,9 +2461,10 @@ if selected_assignments:
             
             st.subheader("⚠️ Mahasiswa yang Perlu Perhatian")
             
-            need_help = metrics['student_stats'][
-                (metrics['student_stats']['passed'] == False) & 
-                (metrics['student_stats']['attempts'] >= 3)
+            student_stats = view.node("metrics")['student_stats']
+            need_help = student_stats[
+                (student_stats['passed'] == False) & 
+                (student_stats['attempts'] >= 3)
             ]
             
             if len(need_help) > 0:
@@ -687,67 +2477,16 @@ if selected_assignments:
         elif page == "Analisis Performa":
             st.header("👤 Analisis Performa Mahasiswa")
             
-            student_list = sorted(df['NRP'].unique())
-            selected_student = st.selectbox("Pilih Mahasiswa:", student_list)
-            
-            student_df = df[df['NRP'] == selected_student].sort_values('Date')
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total Attempt", len(student_df))
-            
-            with col2:
-                st.metric("Nilai Tertinggi", student_df['Nilai'].max())
-            
-            with col3:
-                st.metric("Nilai Rata-rata", f"{student_df['Nilai'].mean():.1f}")
-            
-            with col4:
-                passed = (student_df['Status'] == 'Lulus').any()
-                st.metric("Status", "✅ Lulus" if passed else "❌ Belum Lulus")
-            
-            st.divider()
-            
-            st.plotly_chart(plot_score_progress(df, selected_student), use_container_width=True)
-            
-            st.divider()
-            
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                st.subheader("📝 Riwayat Submission")
-                display_df = student_df[['Date', 'Nilai', 'Status']].copy()
-                display_df['Date'] = display_df['Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
-                st.dataframe(display_df, use_container_width=True, hide_index=True)
-            
-            with col2:
-                st.subheader("📊 Statistik")
-                
-                if len(student_df) > 1:
-                    first_score = student_df['Nilai'].iloc[0]
-                    last_score = student_df['Nilai'].iloc[-1]
-                    improvement = last_score - first_score
-                    
-                    st.metric("Peningkatan", f"{improvement:+.0f}", 
-                             delta=f"{improvement:+.0f} poin")
-                
-                if len(student_df) > 1:
-                    time_diffs = student_df['Date'].diff().dt.total_seconds() / 3600
-                    avg_time = time_diffs.mean()
-                    st.metric("Rata-rata Jeda", f"{avg_time:.1f} jam")
-                
-                if passed:
-                    first_pass_idx = student_df[student_df['Status'] == 'Lulus'].index[0]
-                    attempt_to_pass = list(student_df.index).index(first_pass_idx) + 1
-                    st.metric("Lulus di Attempt ke-", attempt_to_pass)
+            student_performance_section(view, figure_scope)
         
         # PAGE: PATTERN SUBMISSION
         elif page == "Pattern Submission":
             st.header("📊 Pattern & Analisis Waktu Submission")
             
+            rollups = view.node("rollups")
+            
             st.subheader("🔥 Heatmap Waktu Submission")
-            st.plotly_chart(plot_submission_heatmap(df.copy()), use_container_width=True)
+            st.plotly_chart(get_figure(figure_scope + ('heatmap',), plot_submission_heatmap, rollups), use_container_width=True)
             
             st.divider()
             
@@ -755,11 +2494,11 @@ if selected_assignments:
             
             with col1:
                 st.subheader("⏰ Jam Tersibuk")
-                hourly = df.groupby(df['Date'].dt.hour).size().reset_index()
+                hourly = rollups['hour']['count'].reset_index()
                 hourly.columns = ['Hour', 'Count']
                 hourly = hourly.sort_values('Count', ascending=False).head(5)
                 
-                fig = px.bar(hourly, x='Hour', y='Count', 
+                fig = get_figure(figure_scope + ('busiest_hours',), px.bar, hourly, x='Hour', y='Count', 
                            title='Top 5 Jam Tersibuk',
                            color='Count',
                            color_continuous_scale='Blues')
@@ -767,15 +2506,11 @@ if selected_assignments:
             
             with col2:
                 st.subheader("📅 Hari Tersibuk")
-                daily = df.groupby(df['Date'].dt.day_name()).size().reset_index()
+                daily = rollups['weekday_hour']['count'].groupby(level='Weekday').sum().reset_index()
                 daily.columns = ['Day', 'Count']
+                daily['Day'] = pd.Categorical.from_codes(daily['Day'], categories=DAY_NAMES, ordered=True)
                 
-                day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                           'Friday', 'Saturday', 'Sunday']
-                daily['Day'] = pd.Categorical(daily['Day'], categories=day_order, ordered=True)
-                daily = daily.sort_values('Day')
-                
-                fig = px.bar(daily, x='Day', y='Count',
+                fig = get_figure(figure_scope + ('busiest_days',), px.bar, daily, x='Day', y='Count',
                            title='Submission per Hari',
                            color='Count',
                            color_continuous_scale='Greens')
@@ -785,27 +2520,28 @@ if selected_assignments:
             
             st.subheader("🎯 Analisis Jumlah Attempt")
             
+            attempt_sequences = view.node("attempt_sequences")
+            
             col1, col2 = st.columns(2)
             
             with col1:
-                st.plotly_chart(plot_attempts_before_pass(df), use_container_width=True)
+                st.plotly_chart(
+                    get_figure(figure_scope + ('attempts_before_pass',), plot_attempts_before_pass, attempt_sequences['students']),
+                    use_container_width=True
+                )
             
             with col2:
-                df['attempt_number'] = df.groupby('NRP').cumcount() + 1
-                success_by_attempt = df.groupby('attempt_number').agg({
-                    'Status': lambda x: (x == 'Lulus').sum() / len(x) * 100
-                }).reset_index()
-                success_by_attempt.columns = ['Attempt', 'Success Rate']
-                
-                fig = px.line(success_by_attempt, x='Attempt', y='Success Rate',
-                            title='Success Rate per Attempt',
-                            markers=True)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(
+                    get_figure(figure_scope + ('success_by_attempt',), plot_success_by_attempt, attempt_sequences['submissions']),
+                    use_container_width=True
+                )
         
         # PAGE: DASHBOARD DOSEN
         elif page == "Dashboard Dosen":
             st.header("👨‍🏫 Dashboard Pengajar")
             
+            metrics = view.node("metrics")
+            
             st.subheader("📊 Overview Kelas")
             
             col1, col2, col3, col4 = st.columns(4)
@@ -828,38 +2564,16 @@ if selected_assignments:
             
             st.divider()
             
-            st.plotly_chart(plot_pass_rate_by_student(df), use_container_width=True)
+            st.plotly_chart(
+                get_figure(figure_scope + ('pass_rate_by_student',), plot_pass_rate_by_student, view.node("partials")['students']),
+                use_container_width=True
+            )
             
             st.divider()
             
             st.subheader("📈 Trend Performa Kelas")
             
-            daily_stats = df.groupby(df['Date'].dt.date).agg({
-                'Status': lambda x: (x == 'Lulus').sum() / len(x) * 100,
-                'Nilai': 'mean'
-            }).reset_index()
-            daily_stats.columns = ['Date', 'Pass Rate', 'Avg Score']
-            
-            fig = make_subplots(specs=[[{"secondary_y": True}]])
-            
-            fig.add_trace(
-                go.Scatter(x=daily_stats['Date'], y=daily_stats['Pass Rate'],
-                          name='Pass Rate', line=dict(color='green')),
-                secondary_y=False
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=daily_stats['Date'], y=daily_stats['Avg Score'],
-                          name='Avg Score', line=dict(color='blue')),
-                secondary_y=True
-            )
-            
-            fig.update_layout(title='Trend Harian: Pass Rate & Rata-rata Nilai')
-            fig.update_xaxes(title_text='Tanggal')
-            fig.update_yaxes(title_text='Pass Rate (%)', secondary_y=False)
-            fig.update_yaxes(title_text='Rata-rata Nilai', secondary_y=True)
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(get_figure(figure_scope + ('daily_trend',), plot_daily_trend, view.node("rollups")), use_container_width=True)
             
             st.divider()
             
@@ -883,36 +2597,27 @@ if selected_assignments:
             
             st.info("📊 Analisis prediktif menggunakan pattern dari data historis")
             
+            df = view.node("frame")
             st.subheader("📈 Probabilitas Kelulusan per Mahasiswa")
             
-            predictions = []
-            for nrp in df['NRP'].unique():
-                prob = predict_pass_probability(df, nrp)
-                student_data = df[df['NRP'] == nrp]
-                passed = (student_data['Status'] == 'Lulus').any()
-                
-                predictions.append({
-                    'NRP': nrp,
-                    'Probability': prob,
-                    'Attempts': len(student_data),
-                    'Max Score': student_data['Nilai'].max(),
-                    'Status': '✅ Lulus' if passed else '❌ Belum Lulus'
-                })
-            
-            pred_df = pd.DataFrame(predictions)
+            predictions = view.node("pass_predictions")
+            students = view.node("attempt_sequences")['students']
+            
+            # Urutan awal mengikuti kemunculan NRP di data, sama seperti sebelumnya
+            nrp_order = df['NRP'].unique()
+            pred_df = pd.DataFrame({
+                'NRP': list(nrp_order),
+                'Probability': predictions['Probability'].reindex(nrp_order).to_numpy(),
+                'Attempts': students['attempts'].reindex(nrp_order).to_numpy(),
+                'Max Score': students['max_score'].reindex(nrp_order).to_numpy(),
+                'Status': np.where(students['passed'].reindex(nrp_order).to_numpy(), '✅ Lulus', '❌ Belum Lulus'),
+                'Risk Category': predictions['Risk Category'].reindex(nrp_order).to_numpy()
+            })
             pred_df = pred_df.sort_values('Probability', ascending=False)
             
-            def get_risk_color(prob):
-                if prob >= 70:
-                    return '🟢 Low Risk'
-                elif prob >= 40:
-                    return '🟡 Medium Risk'
-                else:
-                    return '🔴 High Risk'
-            
-            pred_df['Risk Category'] = pred_df['Probability'].apply(get_risk_color)
-            
-            fig = px.bar(
+            fig = get_figure(
+                figure_scope + ('pass_probability',),
+                px.bar,
                 pred_df,
                 x='NRP',
                 y='Probability',
@@ -930,91 +2635,13 @@ if selected_assignments:
             
             st.subheader("📋 Detail Prediksi")
             
-            filter_option = st.radio(
-                "Filter:",
-                ["Semua", "High Risk Only", "Belum Lulus Only"]
-            )
-            
-            filtered_pred = pred_df.copy()
-            if filter_option == "High Risk Only":
-                filtered_pred = filtered_pred[filtered_pred['Risk Category'] == '🔴 High Risk']
-            elif filter_option == "Belum Lulus Only":
-                filtered_pred = filtered_pred[filtered_pred['Status'] == '❌ Belum Lulus']
-            
-            st.dataframe(filtered_pred, use_container_width=True, hide_index=True)
+            prediction_detail_section(pred_df)
             
             st.divider()
             
             st.subheader("📈 Prediksi Nilai Next Attempt")
             
-            selected_student = st.selectbox(
-                "Pilih mahasiswa untuk prediksi:",
-                pred_df['NRP'].tolist()
-            )
-            
-            student_history = df[df['NRP'] == selected_student].sort_values('Date')
-            
-            if len(student_history) >= 2:
-                scores = student_history['Nilai'].values
-                attempts = np.arange(len(scores))
-                
-                z = np.polyfit(attempts, scores, 1)
-                p = np.poly1d(z)
-                
-                next_attempt = len(scores)
-                predicted_score = p(next_attempt)
-                predicted_score = max(0, min(100, predicted_score))
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.metric(
-                        "Prediksi Nilai Next Attempt",
-                        f"{predicted_score:.0f}",
-                        delta=f"{predicted_score - scores[-1]:+.0f} dari attempt terakhir"
-                    )
-                    
-                    if predicted_score >= 60:
-                        st.success("✅ Diprediksi akan lulus di attempt berikutnya!")
-                    else:
-                        st.warning("⚠️ Mungkin perlu attempt tambahan")
-                
-                with col2:
-                    fig = go.Figure()
-                    
-                    fig.add_trace(go.Scatter(
-                        x=attempts + 1,
-                        y=scores,
-                        mode='markers',
-                        name='Actual',
-                        marker=dict(size=10, color='blue')
-                    ))
-                    
-                    fig.add_trace(go.Scatter(
-                        x=np.arange(0, next_attempt + 2),
-                        y=p(np.arange(0, next_attempt + 2)),
-                        mode='lines',
-                        name='Trend',
-                        line=dict(dash='dash', color='gray')
-                    ))
-                    
-                    fig.add_trace(go.Scatter(
-                        x=[next_attempt + 1],
-                        y=[predicted_score],
-                        mode='markers',
-                        name='Predicted',
-                        marker=dict(size=15, color='red', symbol='star')
-                    ))
-                    
-                    fig.update_layout(
-                        title=f'Prediksi untuk {selected_student}',
-                        xaxis_title='Attempt',
-                        yaxis_title='Nilai'
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("ℹ️ Tidak cukup data untuk membuat prediksi (minimal 2 attempt)")
+            next_attempt_section(view, pred_df['NRP'].tolist(), predictions, figure_scope)
         
         # PAGE: CUSTOM ANALYTICS
         elif page == "Custom Analytics":
@@ -1022,141 +2649,7 @@ if selected_assignments:
             
             st.info("💡 Buat analisis custom dan export data sesuai kebutuhan")
             
-            st.subheader("🔍 Custom Filters")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                status_filter = st.multiselect(
-                    "Status:",
-                    options=df['Status'].unique(),
-                    default=df['Status'].unique()
-                )
-            
-            with col2:
-                min_score = st.number_input("Nilai Minimum:", 0, 100, 0)
-                max_score = st.number_input("Nilai Maximum:", 0, 100, 100)
-            
-            with col3:
-                date_range = st.date_input(
-                    "Rentang Tanggal:",
-                    value=(df['Date'].min(), df['Date'].max())
-                )
-            
-            filtered_df = df[
-                (df['Status'].isin(status_filter)) &
-                (df['Nilai'] >= min_score) &
-                (df['Nilai'] <= max_score)
-            ]
-            
-            if len(date_range) == 2:
-                filtered_df = filtered_df[
-                    (filtered_df['Date'].dt.date >= date_range[0]) &
-                    (filtered_df['Date'].dt.date <= date_range[1])
-                ]
-            
-            st.success(f"✅ {len(filtered_df)} records setelah filtering")
-            
-            st.divider()
-            
-            st.subheader("📊 Custom Visualizations")
-            
-            viz_type = st.selectbox(
-                "Pilih Tipe Visualisasi:",
-                ["Score Distribution", "Timeline", "Box Plot", "Scatter Plot", "Correlation"]
-            )
-            
-            if viz_type == "Score Distribution":
-                fig = px.histogram(filtered_df, x='Nilai', nbins=20, 
-                                 title='Distribusi Nilai (Filtered)')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif viz_type == "Timeline":
-                timeline_data = filtered_df.groupby(filtered_df['Date'].dt.date).size().reset_index()
-                timeline_data.columns = ['Date', 'Count']
-                fig = px.line(timeline_data, x='Date', y='Count', 
-                            title='Timeline Submission (Filtered)', markers=True)
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif viz_type == "Box Plot":
-                fig = px.box(filtered_df, x='Status', y='Nilai', 
-                           title='Box Plot Nilai per Status (Filtered)')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif viz_type == "Scatter Plot":
-                filtered_df['Attempt Number'] = filtered_df.groupby('NRP').cumcount() + 1
-                fig = px.scatter(filtered_df, x='Attempt Number', y='Nilai', 
-                               color='Status', title='Scatter: Attempt vs Nilai (Filtered)')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif viz_type == "Correlation":
-                corr_df = filtered_df.copy()
-                corr_df['Hour'] = corr_df['Date'].dt.hour
-                corr_df['DayOfWeek'] = corr_df['Date'].dt.dayofweek
-                
-                numeric_cols = ['Nilai', 'Hour', 'DayOfWeek']
-                corr_matrix = corr_df[numeric_cols].corr()
-                
-                fig = px.imshow(corr_matrix, 
-                              title='Correlation Matrix',
-                              labels=dict(color="Correlation"),
-                              color_continuous_scale='RdBu')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            st.divider()
-            
-            st.subheader("📥 Export Data")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="📄 Download Filtered Data (CSV)",
-                    data=csv,
-                    file_name=f"filtered_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            
-            with col2:
-                summary = metrics['student_stats'].to_csv(index=False)
-                st.download_button(
-                    label="📊 Download Summary Stats (CSV)",
-                    data=summary,
-                    file_name=f"summary_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            
-            with col3:
-                full_csv = df.to_csv(index=False)
-                st.download_button(
-                    label="💾 Download Full Dataset (CSV)",
-                    data=full_csv,
-                    file_name=f"full_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            
-            st.divider()
-            
-            st.subheader("📋 Filtered Data Preview")
-            st.dataframe(filtered_df, use_container_width=True)
-            
-            st.subheader("📈 Statistics (Filtered Data)")
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total Records", len(filtered_df))
-            
-            with col2:
-                st.metric("Unique Students", filtered_df['NRP'].nunique())
-            
-            with col3:
-                st.metric("Avg Score", f"{filtered_df['Nilai'].mean():.1f}")
-            
-            with col4:
-                pass_rate = (filtered_df['Status'] == 'Lulus').sum() / len(filtered_df) * 100 if len(filtered_df) > 0 else 0
-                st.metric("Pass Rate", f"{pass_rate:.1f}%")
+            custom_analytics_section(view, figure_scope)
         
         # PAGE: COMPARE ASSIGNMENTS
         elif page == "Compare Assignments":
@@ -1170,9 +2663,20 @@ if selected_assignments:
             
             st.subheader("📊 Perbandingan Metrics")
             
+            # Perbandingan selalu memakai semua assignment yang berhasil dimuat; metrics per assignment
+            # (node ter-cache per versi data) dipakai di perbandingan & analisis kesulitan
+            compare_view = AnalyticsView(snapshots, list(snapshots))
+            assignment_views = {
+                assignment_view.assignments[0]: assignment_view
+                for assignment_view in compare_view.assignment_views()
+            }
+            assignment_metrics = {
+                assignment_name: assignment_view.node("metrics")
+                for assignment_name, assignment_view in assignment_views.items()
+            }
+            
             comparison_data = []
-            for assignment_name, assignment_df in all_data.items():
-                metrics_temp = calculate_metrics(assignment_df)
+            for assignment_name, metrics_temp in assignment_metrics.items():
                 comparison_data.append({
                     'Assignment': assignment_name,
                     'Total Submissions': metrics_temp['total_submissions'],
@@ -1186,6 +2690,8 @@ if selected_assignments:
             
             comparison_df = pd.DataFrame(comparison_data)
             
+            compare_scope = (compare_view.version, tuple(compare_view.assignments), page)
+            
             st.dataframe(comparison_df, use_container_width=True, hide_index=True)
             
             st.divider()
@@ -1193,7 +2699,9 @@ if selected_assignments:
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.bar(
+                fig = get_figure(
+                    compare_scope + ('pass_rate',),
+                    px.bar,
                     comparison_df,
                     x='Assignment',
                     y='Pass Rate (%)',
@@ -1205,7 +2713,9 @@ if selected_assignments:
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                fig = px.bar(
+                fig = get_figure(
+                    compare_scope + ('avg_score',),
+                    px.bar,
                     comparison_df,
                     x='Assignment',
                     y='Avg Score',
@@ -1220,36 +2730,9 @@ if selected_assignments:
             
             st.subheader("👥 Performa Mahasiswa Across Assignments")
             
-            all_students = set()
-            for df_temp in all_data.values():
-                all_students.update(df_temp['NRP'].unique())
-            
-            student_comparison = []
-            for nrp in all_students:
-                student_row = {'NRP': nrp}
-                for assignment_name, assignment_df in all_data.items():
-                    student_data = assignment_df[assignment_df['NRP'] == nrp]
-                    if len(student_data) > 0:
-                        max_score = student_data['Nilai'].max()
-                        passed = (student_data['Status'] == 'Lulus').any()
-                        student_row[f"{assignment_name} - Score"] = max_score
-                        student_row[f"{assignment_name} - Status"] = '✅' if passed else '❌'
-                    else:
-                        student_row[f"{assignment_name} - Score"] = '-'
-                        student_row[f"{assignment_name} - Status"] = '-'
-                
-                student_comparison.append(student_row)
-            
-            student_comparison_df = pd.DataFrame(student_comparison)
-            
-            status_cols = [col for col in student_comparison_df.columns if 'Status' in col]
-            student_comparison_df['Total Passed'] = student_comparison_df[status_cols].apply(
-                lambda row: sum(1 for x in row if x == '✅'),
-                axis=1
-            )
-            
-            student_comparison_df = student_comparison_df.sort_values('Total Passed', ascending=False)
+            student_comparison_df = compare_view.node("student_matrix")
             
+            # Score kosong / status kosong = mahasiswa belum submit assignment tersebut
             st.dataframe(student_comparison_df, use_container_width=True, hide_index=True)
             
             st.divider()
@@ -1257,9 +2740,7 @@ if selected_assignments:
             st.subheader("📈 Analisis Kesulitan Assignment")
             
             difficulty_metrics = []
-            for assignment_name, assignment_df in all_data.items():
-                metrics_temp = calculate_metrics(assignment_df)
-                
+            for assignment_name, metrics_temp in assignment_metrics.items():
                 difficulty_score = (100 - metrics_temp['pass_rate']) + (metrics_temp['avg_attempts'] * 10)
                 
                 difficulty_metrics.append({
@@ -1291,7 +2772,9 @@ if selected_assignments:
                 st.dataframe(difficulty_df, use_container_width=True, hide_index=True)
             
             with col2:
-                fig = px.bar(
+                fig = get_figure(
+                    compare_scope + ('difficulty',),
+                    px.bar,
                     difficulty_df,
                     x='Assignment',
                     y='Difficulty Score',
@@ -1311,16 +2794,18 @@ if selected_assignments:
             
             st.subheader("📊 Distribusi Nilai Comparison")
             
-            combined_for_dist = combine_dataframes(all_data)
-            
-            fig = px.box(
-                combined_for_dist,
-                x='Assignment',
-                y='Nilai',
-                color='Assignment',
-                title='Box Plot Nilai per Assignment'
+            assignment_score_counts = {
+                assignment_name: assignment_view.node("partials")['score_counts']
+                for assignment_name, assignment_view in assignment_views.items()
+            }
+            fig = get_figure(
+                compare_scope + ('score_boxes',),
+                plot_score_boxes,
+                assignment_score_counts,
+                'Box Plot Nilai per Assignment',
+                'Assignment'
             )
-            fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+            fig.update_layout(xaxis_tickangle=-45)
             st.plotly_chart(fig, use_container_width=True)
     
     else:
@@ -1331,5 +2816,5 @@ else:
     st.info("ℹ️ Pilih assignment di sidebar untuk memulai")
     
     with st.expander("📚 Available Assignments"):
-        for assignment_name in SHEETS_CONFIG.keys():
+        for assignment_name in DATA_SOURCE.assignments():
             st.markdown(f"- **{assignment_name}**")
\ No newline at end of file